@@ -12,16 +12,35 @@ optional modules for phase-aware and entanglement-correlation simulations.
 from .encoding import (
     STATE_ZERO,
     STATE_ONE,
-    get_basis_state,
-    get_probability_p1,
     qsim_repr # Base representation function
 )
-from .gates import (
+# The gate, decoder and measurement names dispatch on their input: a single
+# packed int uses the scalar functions, a NumPy batch the fastest batch
+# backend for its size (see dispatch.py; override with use_backend).
+from .dispatch import (
     initialize,
     apply_H_sim,
-    measure
+    measure,
+    get_basis_state,
+    get_probability_p1,
+    # Phase-aware functions
+    initialize_phase_aware,
+    apply_H_phase_aware,
+    apply_PhaseShift_sim,
+    measure_phase_aware,
+    get_phase_index,
+    # Bell pairs
+    create_bell_pair_sim,
+    measure_bell,
+    # Backend control
+    calibrate,
+    use_backend,
+    set_backend,
 )
 
+# --- Sessions (per-context RNG, Bell pair store and diagnostics) ---
+from .session import Session, current_session
+
 # --- Advanced Simulation Modules ---
 # Users need to import from these explicitly for advanced features
 
@@ -29,16 +48,14 @@ from .gates import (
 # Exposing the modules directly is often cleaner
 from . import phase_encoding
 from . import phase_gates
-# Alternatively, expose specific functions if preferred:
-# from .phase_gates import initialize_phase_aware, apply_H_phase_aware, measure_phase_aware, apply_PhaseShift_sim
-# from .phase_encoding import phase_qsim_repr
+# The phase-aware gates are also exported above as dispatched functions
 
 # Entanglement Simulation (Classical Correlation)
 # Exposing the modules directly:
 from . import entanglement # Module managing pairs
 # Note: Entanglement currently relies on phase_gates for its qubit representation
 # You might also want to expose entanglement_encoding helpers if needed externally
-# from .entanglement import create_bell_pair_sim, measure_entangled
+# create_bell_pair_sim and measure_bell are exported above as dispatched functions
 
 
 # --- Package Version ---
@@ -0,0 +1,470 @@
+# src/classical_quantum_sim/batch.py
+
+"""
+Batched, in-place capable versions of the gates, decoders and measurement.
+
+A batch is a NumPy integer array of packed 16-bit states (any shape; use
+STATE_DTYPE = uint16 to keep memory at 2 bytes per qubit). Every function
+here mirrors the scalar function of the same name in `encoding`, `gates`
+or `phase_gates`, and accepts:
+
+- `out=`: array to write the result into. Pass the input array itself
+  (`out=states`) to update a batch in place without a second copy.
+- `workspace=`: a `Workspace` holding the random generator and the
+  temporary buffers (uniform draws, masks, integer scratch). Reusing one
+  workspace across a long circuit means no allocations after the first
+  gate has sized its buffers. A workspace may also carry a
+  `trajectory.TrajectoryRecorder` that records every gate's result.
+  Without one, the current session's workspace is used (see `session`),
+  so draws follow the session seed.
+
+If Numba is installed the compiled ufuncs from `kernels` do the work in a
+single fused loop for the dtypes they support (`kernels.supports`);
+otherwise the same results are produced with NumPy bitwise operations
+writing into workspace buffers.
+
+Both paths release the GIL inside their array loops, so batches scale with
+threads in one process. A workspace is scratch space for one thread at a
+time: give each thread its own (`session.Session.workspace` is per thread).
+
+Example:
+    ws = Workspace(seed=1234)
+    states = initialize(10**6, STATE_ZERO)
+    apply_H_phase_aware(states, out=states, workspace=ws)
+    apply_PhaseShift_sim(states, math.pi / 2, out=states, workspace=ws)
+    outcomes, states = measure(states, out=states, workspace=ws)
+"""
+
+try:
+    import numpy as np
+except ImportError as exc: # Batched simulation needs the optional NumPy dependency
+    raise ImportError(
+        "classical_quantum_sim.batch requires NumPy. "
+        "Install it with 'pip install classical-quantum-sim[batch]'."
+    ) from exc
+
+from . import kernels, sampling as _sampling
+from .encoding import (
+    BASIS_STATE_SHIFT, BASIS_STATE_MASK, STATE_ZERO, STATE_ONE,
+    PROB_AMP_SHIFT, PROB_AMP_MASK, MAX_PROB_AMP_INT,
+    _probability_to_int
+)
+from .phase_encoding import (
+    PHASE_SHIFT, PHASE_MASK, NUM_PHASE_STEPS, RADIANS_PER_STEP,
+    _radians_to_phase_index
+)
+from .gates import initialize as _initialize_scalar
+from .phase_gates import DEFAULT_PHASE_INDEX, initialize_phase_aware as _initialize_phase_aware_scalar
+from .session import current_session
+
+# --- Constants ---
+STATE_DTYPE = np.uint16
+OUTCOME_DTYPE = np.uint8
+
+_STATE_BITS = 0xFFFF
+_KEEP_NOT_PROB = _STATE_BITS & ~PROB_AMP_MASK # Non-negative masks so uint16 arrays accept them
+_KEEP_NOT_PHASE = _STATE_BITS & ~PHASE_MASK
+_PHASE_INDEX_MASK = NUM_PHASE_STEPS - 1 # NUM_PHASE_STEPS is a power of two
+_H_PROB_BITS = _probability_to_int(0.5) << PROB_AMP_SHIFT
+_PROB_STEP = 1 << PROB_AMP_SHIFT
+_COLLAPSED_ZERO = _initialize_scalar(STATE_ZERO)
+_COLLAPSED_ONE = _initialize_scalar(STATE_ONE)
+
+
+class Workspace:
+    """
+    Reusable random generator and scratch buffers for batched operations.
+
+    Buffers grow to the largest batch seen and are then reused, so a long
+    circuit over a fixed-size batch allocates nothing after warm-up.
+
+    Args:
+        seed: Seed for a new `numpy.random.Generator` (ignored if `rng` is given).
+        rng: An existing `numpy.random.Generator` to draw from.
+        size: Optional number of elements to preallocate.
+        recorder: Optional `trajectory.TrajectoryRecorder`; every batched gate
+                  and measurement using this workspace records its result
+                  (`measure_bell` records the A lanes only).
+    """
+
+    def __init__(self, seed=None, rng=None, size: int = 0, recorder=None):
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.recorder = recorder
+        self._buffers = {}
+        if size:
+            self.reserve(size)
+
+    def reserve(self, size: int, state_dtype=STATE_DTYPE) -> None:
+        """Preallocates buffers for batches of up to `size` elements."""
+        for name, dtype in (("draws", np.float64), ("probs", np.float64),
+                            ("mask", np.bool_), ("scratch", state_dtype)):
+            self._buffer(name, size, dtype)
+
+    def _buffer(self, name: str, size: int, dtype) -> "np.ndarray":
+        """Returns a 1-D buffer of at least `size` elements, growing it if needed."""
+        key = (name, np.dtype(dtype))
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.size < size:
+            buffer = np.empty(size, dtype=dtype)
+            self._buffers[key] = buffer
+        return buffer
+
+    def buffer_like(self, name: str, array: "np.ndarray", dtype=None) -> "np.ndarray":
+        """Returns a scratch view shaped like `array` (contents are undefined)."""
+        dtype = array.dtype if dtype is None else dtype
+        return self._buffer(name, array.size, dtype)[:array.size].reshape(array.shape)
+
+    def uniform(self, shape, sampling: str = "iid") -> "np.ndarray":
+        """
+        Fills and returns a reused buffer of uniform draws in [0.0, 1.0).
+
+        `sampling` selects the mode (see `sampling.SAMPLING_MODES`); only
+        "iid" and "antithetic" are allocation-free.
+        """
+        size = int(np.prod(shape))
+        draws = self._buffer("draws", size, np.float64)[:size].reshape(shape)
+        if sampling == "iid":
+            self.rng.random(out=draws)
+        else:
+            _sampling.fill_uniform(draws, sampling, self.rng)
+        return draws
+
+    def mask_like(self, array: "np.ndarray") -> "np.ndarray":
+        """Returns a reused boolean buffer shaped like `array`."""
+        return self.buffer_like("mask", array, np.bool_)
+
+
+# --- Internal Helpers ---
+
+def _workspace(workspace):
+    """Returns the given workspace or the current session's one."""
+    return workspace if workspace is not None else current_session().workspace
+
+def _as_states(states) -> "np.ndarray":
+    """Converts input to an integer state array (no copy if already one)."""
+    states = np.asarray(states)
+    if states.dtype.kind not in "iu":
+        raise TypeError(f"Batched states must be an integer array, got dtype {states.dtype}")
+    return states
+
+def _output(states: "np.ndarray", out, dtype=None) -> "np.ndarray":
+    """Returns `out`, allocating a new array shaped like `states` if it is None."""
+    if out is None:
+        return np.empty(states.shape, dtype=states.dtype if dtype is None else dtype)
+    if out.shape != states.shape:
+        raise ValueError(f"out has shape {out.shape}, expected {states.shape}")
+    return out
+
+def _recorded(ws, states: "np.ndarray", label: str) -> "np.ndarray":
+    """Passes `states` to the trajectory recorder of the workspace used, if any, and returns it."""
+    if ws.recorder is not None:
+        ws.recorder.record(states, label)
+    return states
+
+def _phase_delta(angle_rad):
+    """Quantizes a shift angle (scalar or array) to a phase index delta (0-15)."""
+    if np.ndim(angle_rad) == 0:
+        return _radians_to_phase_index(float(angle_rad))
+    # Same rounding as _radians_to_phase_index (np.rint rounds half to even like round())
+    steps = np.rint(np.remainder(angle_rad, 2 * np.pi) / RADIANS_PER_STEP)
+    return steps.astype(np.int64) % NUM_PHASE_STEPS
+
+# --- Initialization ---
+
+def initialize(shape, basis_state: int = STATE_ZERO, out=None, dtype=STATE_DTYPE) -> "np.ndarray":
+    """
+    Creates (or fills `out` with) a batch of qubits in a definite basis state.
+
+    Args:
+        shape: Batch shape (ignored if `out` is given).
+        basis_state: STATE_ZERO or STATE_ONE.
+        out: Optional array to fill in place.
+        dtype: Integer dtype of a newly created batch.
+
+    Returns:
+        The initialized batch.
+    """
+    value = _initialize_scalar(basis_state)
+    if out is None:
+        return np.full(shape, value, dtype=dtype)
+    out.fill(value)
+    return out
+
+def initialize_phase_aware(shape, basis_state: int = STATE_ZERO,
+                           initial_phase_index: int = DEFAULT_PHASE_INDEX,
+                           out=None, dtype=STATE_DTYPE) -> "np.ndarray":
+    """Batched `phase_gates.initialize_phase_aware`; see `initialize` for arguments."""
+    value = _initialize_phase_aware_scalar(basis_state, initial_phase_index)
+    if out is None:
+        return np.full(shape, value, dtype=dtype)
+    out.fill(value)
+    return out
+
+# --- Decoders ---
+
+def get_basis_state(states, out=None) -> "np.ndarray":
+    """Batched basis state (0 or 1) of each element."""
+    states = _as_states(states)
+    out = _output(states, out)
+    np.bitwise_and(states, BASIS_STATE_MASK, out=out, casting="unsafe")
+    return np.right_shift(out, BASIS_STATE_SHIFT, out=out)
+
+def get_probability_p1(states, out=None) -> "np.ndarray":
+    """Batched P(|1>) as float64 in [0.0, 1.0]."""
+    states = _as_states(states)
+    if kernels.supports(states):
+        return kernels.get_probability_p1(states, out=out)
+    return _get_probability_p1_numpy(states, out)
+
+def _get_probability_p1_numpy(states, out) -> "np.ndarray":
+    out = _output(states, out, np.float64)
+    np.bitwise_and(states, PROB_AMP_MASK, out=out, casting="unsafe")
+    return np.divide(out, MAX_PROB_AMP_INT * _PROB_STEP, out=out)
+
+def get_phase_index(states, out=None) -> "np.ndarray":
+    """Batched phase index (0-15) of each element."""
+    states = _as_states(states)
+    out = _output(states, out)
+    np.bitwise_and(states, PHASE_MASK, out=out, casting="unsafe")
+    return np.right_shift(out, PHASE_SHIFT, out=out)
+
+def get_phase_radians(states, out=None) -> "np.ndarray":
+    """Batched phase angle in radians [0, 2pi)."""
+    states = _as_states(states)
+    out = _output(states, out, np.float64)
+    np.bitwise_and(states, PHASE_MASK, out=out, casting="unsafe")
+    return np.multiply(out, RADIANS_PER_STEP / (1 << PHASE_SHIFT), out=out)
+
+# --- Gates ---
+
+def apply_H_sim(states, out=None, workspace=None) -> "np.ndarray":
+    """
+    Batched `gates.apply_H_sim`: definite states go to P(|1>)=0.5,
+    superposition states are left unchanged (no per-element warning).
+    """
+    states = _as_states(states)
+    ws = _workspace(workspace)
+    if kernels.supports(states):
+        out = kernels.apply_H_sim(states, out=out)
+    else:
+        out = _apply_H_sim_numpy(states, out, ws)
+    return _recorded(ws, out, "apply_H_sim")
+
+def _apply_H_sim_numpy(states, out, ws) -> "np.ndarray":
+    out = _output(states, out)
+    scratch = ws.buffer_like("scratch", states)
+    definite = ws.mask_like(states)
+    # Adding one probability step maps both 0 and 1023 (wrapping) to <= one step
+    np.bitwise_and(states, PROB_AMP_MASK, out=scratch)
+    np.add(scratch, _PROB_STEP, out=scratch)
+    np.bitwise_and(scratch, PROB_AMP_MASK, out=scratch)
+    np.less_equal(scratch, _PROB_STEP, out=definite)
+    np.bitwise_and(states, _KEEP_NOT_PROB, out=scratch)
+    np.bitwise_or(scratch, _H_PROB_BITS, out=scratch)
+    if out is not states:
+        np.copyto(out, states)
+    np.copyto(out, scratch, where=definite)
+    return out
+
+def apply_H_phase_aware(states, out=None, workspace=None) -> "np.ndarray":
+    """Batched `phase_gates.apply_H_phase_aware` (P(|1>)=0.5, +pi phase for |1> inputs)."""
+    states = _as_states(states)
+    ws = _workspace(workspace)
+    if kernels.supports(states):
+        out = kernels.apply_H_phase_aware(states, out=out)
+    else:
+        out = _apply_H_phase_aware_numpy(states, out, ws)
+    return _recorded(ws, out, "apply_H_phase_aware")
+
+def _apply_H_phase_aware_numpy(states, out, ws) -> "np.ndarray":
+    out = _output(states, out)
+    scratch = ws.buffer_like("scratch", states)
+    was_one = ws.mask_like(states)
+    np.bitwise_and(states, PROB_AMP_MASK, out=scratch)
+    np.equal(scratch, PROB_AMP_MASK, out=was_one)
+    # Shifted phase bits for the |1> inputs
+    np.right_shift(states, PHASE_SHIFT, out=scratch)
+    np.add(scratch, NUM_PHASE_STEPS // 2, out=scratch)
+    np.bitwise_and(scratch, _PHASE_INDEX_MASK, out=scratch)
+    np.left_shift(scratch, PHASE_SHIFT, out=scratch)
+    np.bitwise_and(states, _KEEP_NOT_PROB, out=out)
+    np.bitwise_or(out, _H_PROB_BITS, out=out)
+    np.bitwise_and(out, _KEEP_NOT_PHASE, out=out, where=was_one)
+    np.bitwise_or(out, scratch, out=out, where=was_one)
+    return out
+
+def apply_PhaseShift_sim(states, angle_rad, out=None, workspace=None) -> "np.ndarray":
+    """
+    Batched `phase_gates.apply_PhaseShift_sim`.
+
+    `angle_rad` may be a scalar or an array broadcastable to `states`.
+    Scalar angles are allocation-free; array angles are quantized first.
+    """
+    states = _as_states(states)
+    ws = _workspace(workspace)
+    if kernels.supports(states):
+        out = _apply_PhaseShift_sim_compiled(states, angle_rad, out)
+    else:
+        out = _apply_PhaseShift_sim_numpy(states, angle_rad, out, ws)
+    return _recorded(ws, out, "apply_PhaseShift_sim")
+
+def _apply_PhaseShift_sim_compiled(states, angle_rad, out) -> "np.ndarray":
+    # Quantize the angle once instead of per element inside the kernel
+    return kernels.shift_phase_index(states, _phase_delta(angle_rad), out=out)
+
+def _apply_PhaseShift_sim_numpy(states, angle_rad, out, ws) -> "np.ndarray":
+    out = _output(states, out)
+    scratch = ws.buffer_like("scratch", states)
+    delta = _phase_delta(angle_rad)
+    if isinstance(delta, np.ndarray):
+        delta = delta.astype(states.dtype)
+    np.right_shift(states, PHASE_SHIFT, out=scratch)
+    np.add(scratch, delta, out=scratch)
+    np.bitwise_and(scratch, _PHASE_INDEX_MASK, out=scratch)
+    np.left_shift(scratch, PHASE_SHIFT, out=scratch)
+    np.bitwise_and(states, _KEEP_NOT_PHASE, out=out)
+    np.bitwise_or(out, scratch, out=out)
+    return out
+
+# --- Circuits ---
+
+# Gates usable in circuits, by function name (same names as the scalar gates)
+CIRCUIT_GATES = {
+    "apply_H_sim": apply_H_sim,
+    "apply_H_phase_aware": apply_H_phase_aware,
+    "apply_PhaseShift_sim": apply_PhaseShift_sim,
+}
+
+def resolve_circuit(circuit) -> list:
+    """
+    Normalizes a circuit to a list of (gate_name, args) tuples.
+
+    Each step may be a gate function (the scalar one from `gates` /
+    `phase_gates` or the batched one from this module), a gate name, or a
+    tuple of either followed by its extra arguments, e.g.
+    `[phase_gates.apply_H_phase_aware, (phase_gates.apply_PhaseShift_sim, math.pi)]`.
+    The result only contains names and plain arguments, so it pickles cheaply,
+    and resolving an already resolved circuit returns it unchanged.
+    """
+    resolved = []
+    for step in circuit:
+        if isinstance(step, (tuple, list)) and len(step) == 2 and isinstance(step[1], tuple):
+            gate, args = step # Already resolved
+        else:
+            gate, *args = step if isinstance(step, (tuple, list)) else (step,)
+        name = gate if isinstance(gate, str) else getattr(gate, "__name__", None)
+        if name not in CIRCUIT_GATES:
+            raise ValueError(f"Unsupported circuit gate: {gate!r}")
+        resolved.append((name, tuple(args)))
+    return resolved
+
+def apply_circuit(states, circuit, out=None, workspace=None) -> "np.ndarray":
+    """Applies every gate of `circuit` (see `resolve_circuit`) to the batch."""
+    states = _as_states(states)
+    out = _output(states, out)
+    current = states
+    for name, args in resolve_circuit(circuit):
+        current = CIRCUIT_GATES[name](current, *args, out=out, workspace=workspace)
+    if current is states and out is not states: # Empty circuit
+        np.copyto(out, states)
+    return out
+
+# --- Measurement ---
+
+def measure(states, out=None, outcomes=None, workspace=None, sampling: str = "iid") -> tuple:
+    """
+    Batched `gates.measure`: collapses every element with one uniform draw.
+
+    Args:
+        states: Batch of packed states.
+        out: Array for the collapsed states (may be `states` itself).
+        outcomes: Optional uint8 array for the measured basis states.
+        workspace: Supplies the random generator and the draw buffer.
+        sampling: How the batch's draws are generated: "iid" (independent),
+                  or a variance-reduction mode from `sampling.SAMPLING_MODES`
+                  ("antithetic", "stratified", "sobol") that spreads the
+                  draws evenly, e.g. over many copies of the same state.
+
+    Returns:
+        A tuple (outcomes, collapsed_states).
+    """
+    states = _as_states(states)
+    ws = _workspace(workspace)
+    draws = ws.uniform(states.shape, sampling)
+    outcomes, collapsed = _collapse(states, draws, out, outcomes, ws)
+    _recorded(ws, collapsed, "measure")
+    return outcomes, collapsed
+
+# Phase-aware measurement collapses to the same integers (phase reset to index 0)
+measure_phase_aware = measure
+
+# Bell state types whose two outcomes are equal (phi) or opposite (psi)
+_CORRELATED_BELL_TYPES = ("phi+", "phi-")
+_ANTICORRELATED_BELL_TYPES = ("psi+", "psi-")
+
+def measure_bell(states_a, states_b, bell_type: str = "phi+", out_a=None, out_b=None,
+                 outcomes=None, workspace=None, sampling: str = "iid") -> tuple:
+    """
+    Batched measurement of simulated Bell pairs (see `entanglement.create_bell_pair_sim`).
+
+    Qubit A is measured with the given sampling mode; partner B collapses
+    to the same outcome for 'phi' types and the opposite one for 'psi'
+    types (phase differences are ignored, as in pair creation). Both
+    collapse to definite states with the phase / entanglement ID bits cleared.
+    A trajectory recorder on the workspace records the collapsed A lanes only.
+
+    Args:
+        states_a: Batch of first qubits of each pair.
+        states_b: Batch of partner qubits (same shape; only replaced).
+        bell_type: 'phi+', 'phi-', 'psi+' or 'psi-'.
+        out_a, out_b: Optional arrays for the collapsed A and B states.
+        outcomes: Optional uint8 array for A's outcomes.
+        workspace: Supplies the random generator and buffers.
+        sampling: Sampling mode for A's draws (see `measure`).
+
+    Returns:
+        A tuple (outcomes_a, collapsed_a, collapsed_b).
+    """
+    if bell_type not in _CORRELATED_BELL_TYPES + _ANTICORRELATED_BELL_TYPES:
+        raise ValueError("Unsupported Bell state type")
+    states_a = _as_states(states_a)
+    states_b = _as_states(states_b)
+    if states_a.shape != states_b.shape:
+        raise ValueError("Bell pair batches must have the same shape")
+    ws = _workspace(workspace)
+    draws = ws.uniform(states_a.shape, sampling)
+    outcomes, collapsed_a = _collapse(states_a, draws, out_a, outcomes, ws)
+    out_b = _output(states_b, out_b)
+    partner_is_one = ws.mask_like(states_b)
+    if bell_type in _CORRELATED_BELL_TYPES:
+        np.not_equal(outcomes, STATE_ZERO, out=partner_is_one)
+    else:
+        np.equal(outcomes, STATE_ZERO, out=partner_is_one)
+    out_b.fill(_COLLAPSED_ZERO)
+    np.copyto(out_b, _COLLAPSED_ONE, where=partner_is_one)
+    _recorded(ws, collapsed_a, "measure_bell") # A lanes only: a recorder follows one set of lanes
+    return outcomes, collapsed_a, out_b
+
+def _collapse(states, draws, out, outcomes, ws) -> tuple:
+    """Collapses `states` against the given uniform draws."""
+    if kernels.supports(states):
+        return _collapse_compiled(states, draws, out, outcomes, ws)
+    return _collapse_numpy(states, draws, out, outcomes, ws)
+
+def _collapse_compiled(states, draws, out, outcomes, ws) -> tuple:
+    outcomes = _output(states, outcomes, OUTCOME_DTYPE)
+    out = kernels.measure(states, draws, out=out)
+    np.bitwise_and(out, BASIS_STATE_MASK, out=outcomes, casting="unsafe")
+    return outcomes, out
+
+def _collapse_numpy(states, draws, out, outcomes, ws) -> tuple:
+    outcomes = _output(states, outcomes, OUTCOME_DTYPE)
+    out = _output(states, out)
+    probs = ws.buffer_like("probs", states, np.float64)
+    is_one = ws.mask_like(states)
+    get_probability_p1(states, out=probs)
+    np.less(draws, probs, out=is_one)
+    out.fill(_COLLAPSED_ZERO)
+    np.copyto(out, _COLLAPSED_ONE, where=is_one)
+    np.copyto(outcomes, is_one, casting="unsafe")
+    return outcomes, out
@@ -0,0 +1,197 @@
+# src/classical_quantum_sim/cli.py
+
+"""
+Command-line batch runner: `classical-quantum-sim [JOBS.jsonl]`.
+
+Reads one JSON job per line from a file (or stdin) and writes one JSON
+result per line to stdout as batches complete. A job simulates `shots`
+measurements of a single qubit after a circuit:
+
+    {"id": "a", "circuit": ["apply_H_phase_aware", ["apply_PhaseShift_sim", 1.57]],
+     "shots": 1000, "seed": 7}
+
+Job fields:
+- circuit: List of steps; each step is a gate name from
+  `batch.CIRCUIT_GATES` or a list of the name and its extra arguments.
+- shots: Number of measurements (default 1024).
+- seed: Seed for this job's draws (default: unseeded).
+- basis_state, initial_phase_index: Initial state (default 0, 0).
+- sampling: Sampling mode from `sampling.SAMPLING_MODES` (default "iid").
+- id: Returned with the result and with any error (default: the input
+  line number, which also identifies lines that are not JSON objects).
+
+Result fields: id, shots, ones (number of |1> outcomes), p1 (ones / shots),
+state (packed state before measurement) and state_p1 (its exact P(|1>));
+or id and error for a job that could not be run.
+
+Jobs with the same gate sequence and sampling mode are grouped into one
+batch, whatever their angles, which a worker process evaluates in a single
+vectorized pass. A job's
+outcomes depend only on its own seed, never on how it was grouped or on
+`--chunk-size` (every sampling mode spans all of the job's shots). Memory
+stays bounded: at most `--max-buffered` jobs wait to be grouped, at most
+`--max-pending` batches are in flight, and workers measure at most
+`--chunk-size` shots at a time. A partial batch is sent once it has waited
+`--linger` seconds, so results keep streaming while input arrives slowly.
+A throughput summary goes to stderr.
+
+The command needs NumPy (`pip install classical-quantum-sim[batch]`); the
+job runner itself lives in `jobs`.
+
+`classical-quantum-sim --calibrate` instead times the batch backends on
+this machine and caches the results for automatic dispatch (see `dispatch`).
+"""
+
+import argparse
+import os
+import queue
+import stat
+import sys
+import threading
+import time
+
+from . import dispatch
+
+READ_AHEAD = 1024 # Input lines queued ahead of the runner
+
+def _parse_args(argv):
+    from . import jobs # Imported by main, which reports a missing NumPy
+    parser = argparse.ArgumentParser(
+        prog="classical-quantum-sim",
+        description="Run JSON-lines simulation jobs in batches and stream JSON-lines results.",
+    )
+    parser.add_argument("input", nargs="?", default="-",
+                        help="Job file, one JSON object per line ('-' or omitted: stdin).")
+    parser.add_argument("-o", "--output", default="-", help="Result file (default: stdout).")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes; 0 runs every batch in this process (default: CPU count).")
+    parser.add_argument("--batch-size", type=int, default=jobs.DEFAULT_BATCH_SIZE,
+                        help=f"Jobs per batch (default: {jobs.DEFAULT_BATCH_SIZE}).")
+    parser.add_argument("--max-buffered", type=int, default=None,
+                        help="Jobs held while grouping before a partial batch is sent "
+                             "(default: batch size x workers).")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="Batches in flight at once (default: 2 x workers).")
+    parser.add_argument("--chunk-size", type=int, default=jobs.DEFAULT_CHUNK_SIZE,
+                        help=f"Shots measured at a time per job (default: {jobs.DEFAULT_CHUNK_SIZE}).")
+    parser.add_argument("--linger", type=float, default=jobs.DEFAULT_LINGER,
+                        help="Seconds a partial batch waits for more jobs before it is sent "
+                             f"(default: {jobs.DEFAULT_LINGER}).")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not print the summary.")
+    parser.add_argument("--calibrate", action="store_true",
+                        help=f"Time the batch backends, cache the results in {dispatch.cache_path()} and exit.")
+    args = parser.parse_args(argv)
+    for name in ("workers", "batch_size", "max_buffered", "max_pending", "chunk_size"):
+        value = getattr(args, name)
+        if value is not None and value < (0 if name == "workers" else 1):
+            parser.error(f"--{name.replace('_', '-')} is out of range")
+    if not args.linger >= 0:
+        parser.error("--linger is out of range")
+    if not args.calibrate:
+        # Unreadable paths are reported like bad argument values, not as a traceback
+        args.source = args.sink = None
+        try:
+            args.source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+            args.sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        except OSError as exc:
+            if args.source not in (None, sys.stdin):
+                args.source.close()
+            parser.error(f"cannot open {exc.filename!r}: {exc.strerror}")
+    return args
+
+
+def _read_lines(source, lines: queue.Queue) -> None:
+    """Feeds (line_number, line) pairs to `lines`, then None (or the read error)."""
+    try:
+        for item in enumerate(source, start=1):
+            lines.put(item)
+    except Exception as exc:
+        lines.put(exc)
+    else:
+        lines.put(None)
+
+def _input_lines(source, runner):
+    """
+    Yields the (line_number, line) pairs of `source`.
+
+    Pipes and terminals are read on their own thread, so that while input
+    is idle partial batches are still sent after `--linger` seconds and
+    results keep streaming. Regular files never leave the runner waiting
+    and are read directly.
+    """
+    try:
+        regular_file = stat.S_ISREG(os.fstat(source.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError): # e.g. an in-memory stream
+        regular_file = True
+    if regular_file:
+        yield from enumerate(source, start=1)
+        return
+    lines = queue.Queue(READ_AHEAD)
+    threading.Thread(target=_read_lines, args=(source, lines), daemon=True).start()
+    while True:
+        try:
+            item = lines.get(timeout=runner.timeout())
+        except queue.Empty:
+            runner.poll()
+            continue
+        if item is None:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+def _calibrate(quiet: bool) -> int:
+    profile = dispatch.calibrate(verbose=not quiet)
+    for op, thresholds in profile["ops"].items():
+        print(f"{op}: " + ", ".join(f">={size}: {backend}" for size, backend in thresholds))
+    print(f"Wrote {dispatch.cache_path()}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    """Entry point of the `classical-quantum-sim` command; returns the exit status."""
+    try:
+        from . import jobs
+    except ImportError as exc: # NumPy is an optional dependency
+        print(exc, file=sys.stderr)
+        return 1
+    args = _parse_args(argv)
+    if args.calibrate:
+        return _calibrate(args.quiet)
+    slots = max(args.workers, 1)
+    source, output = args.source, args.sink
+    runner = jobs.Runner(
+        output,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        max_buffered=args.max_buffered or args.batch_size * slots,
+        max_pending=args.max_pending or 2 * slots,
+        chunk_size=args.chunk_size,
+        linger=args.linger,
+    )
+    started = time.perf_counter()
+    try:
+        for line_number, line in _input_lines(source, runner):
+            if line.strip():
+                runner.add_line(line, line_number)
+    finally:
+        runner.close()
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - started
+
+    if not args.quiet:
+        rate = 1.0 / elapsed if elapsed > 0 else 0.0
+        print(
+            f"{runner.jobs} jobs ({runner.errors} failed) in {runner.batches} batches, "
+            f"{runner.shots} shots in {elapsed:.3f} s: "
+            f"{runner.jobs * rate:.1f} jobs/s, {runner.shots * rate:.4g} shots/s",
+            file=sys.stderr,
+        )
+    return 1 if runner.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
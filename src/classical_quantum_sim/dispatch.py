@@ -0,0 +1,427 @@
+# src/classical_quantum_sim/dispatch.py
+
+"""
+Automatic backend selection behind the public gate, decoder and measurement names.
+
+The functions exported from the package (`initialize`, `apply_H_sim`,
+`measure`, the phase and Bell pair functions) accept either a single
+packed state or a batch and pick an implementation per call:
+
+- Python / NumPy integer scalars use the scalar functions in `gates`,
+  `phase_gates` and `entanglement` (with their `session=` semantics).
+- Arrays use one of the batch backends:
+  - "numpy": NumPy bitwise operations (`batch`).
+  - "lut": 65536-entry lookup tables (`lut`; uint16 batches, scalar angles).
+  - "compiled": Numba ufuncs (`kernels`; needs the `jit` extra; uint16,
+    int32 and int64 batches).
+
+All backends give identical results and consume random draws identically,
+so the choice only affects speed. Which batch backend is fastest depends on
+the batch size and the host; `calibrate()` (or
+`classical-quantum-sim --calibrate`) times every backend over a
+range of sizes and caches the crossover points as JSON in
+`$CLASSICAL_QUANTUM_SIM_DISPATCH_CACHE`, or by default
+`~/.cache/classical_quantum_sim/dispatch.json`. Without a calibration
+the order of preference is compiled, then lut, then numpy. The cache and
+the environment variables below are read once per process; `calibrate`
+and `reload` refresh them.
+
+For reproducible benchmarks, force a backend with `use_backend("numpy")`
+(or `set_backend`; both apply to the current thread / context) or the
+`CLASSICAL_QUANTUM_SIM_BACKEND` environment variable. Calls that the
+forced backend cannot handle (e.g. "lut" with int64 states) use "numpy".
+
+Batch calls without a `workspace=` use the calling thread's workspace of the session
+(see `session.current_session`), so seeded sessions also make batched
+measurement reproducible.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import json
+import numbers
+import os
+import platform
+import timeit
+
+from . import encoding, entanglement, gates, phase_encoding, phase_gates
+from .encoding import STATE_ZERO
+from .phase_gates import DEFAULT_PHASE_INDEX
+from .session import resolve_session
+
+BACKENDS = ("numpy", "lut", "compiled")
+BACKEND_ENV = "CLASSICAL_QUANTUM_SIM_BACKEND"
+CACHE_ENV = "CLASSICAL_QUANTUM_SIM_DISPATCH_CACHE"
+PROFILE_VERSION = 1
+CALIBRATED_OPS = ("apply_H_sim", "apply_H_phase_aware", "apply_PhaseShift_sim",
+                  "get_probability_p1", "measure")
+CALIBRATION_SIZES = tuple(4 ** k for k in range(11)) # 1 to 2^20 lanes
+
+_PREFERENCE = ("compiled", "lut", "numpy") # Used for sizes without a calibration
+_CALIBRATION_ELEMENTS = 1 << 18 # Elements processed per timing sample...
+_CALIBRATION_MAX_CALLS = 1000 # ...but no more calls than this for tiny batches
+_CALIBRATION_ANGLE = 1.0
+
+# Backend forced with set_backend / use_backend in this context
+_forced_backend = contextvars.ContextVar("classical_quantum_sim_backend", default=None)
+
+
+# --- Backend Implementations (batch inputs) ---
+
+@functools.lru_cache(maxsize=None)
+def _batch():
+    from . import batch # NumPy is optional; only batch inputs need it
+    return batch
+
+@functools.lru_cache(maxsize=None)
+def _lut():
+    from . import lut
+    return lut
+
+@functools.lru_cache(maxsize=None)
+def _kernels():
+    from . import kernels
+    return kernels
+
+@functools.lru_cache(maxsize=None)
+def _implementations(op: str) -> dict:
+    """Backend name -> function(states, *args, out, workspace) for a gate or decoder."""
+    batch = _batch()
+    if op == "apply_H_sim":
+        return {
+            "numpy": batch._apply_H_sim_numpy,
+            "lut": lambda states, out, ws: _lut().apply_H_sim(states, out),
+            "compiled": lambda states, out, ws: _kernels().apply_H_sim(states, out=out),
+        }
+    if op == "apply_H_phase_aware":
+        return {
+            "numpy": batch._apply_H_phase_aware_numpy,
+            "lut": lambda states, out, ws: _lut().apply_H_phase_aware(states, out),
+            "compiled": lambda states, out, ws: _kernels().apply_H_phase_aware(states, out=out),
+        }
+    if op == "apply_PhaseShift_sim":
+        return {
+            "numpy": batch._apply_PhaseShift_sim_numpy,
+            "lut": lambda states, angle, out, ws: _lut().apply_PhaseShift_sim(states, angle, out),
+            "compiled": lambda states, angle, out, ws: batch._apply_PhaseShift_sim_compiled(states, angle, out),
+        }
+    if op == "get_probability_p1":
+        return {
+            "numpy": lambda states, out, ws: batch._get_probability_p1_numpy(states, out),
+            "lut": lambda states, out, ws: _lut().get_probability_p1(states, out),
+            "compiled": lambda states, out, ws: _kernels().get_probability_p1(states, out=out),
+        }
+    if op == "measure":
+        return {
+            "numpy": batch._collapse_numpy,
+            "lut": _lut().collapse,
+            "compiled": batch._collapse_compiled,
+        }
+    raise ValueError(f"No batch backends for {op!r}")
+
+
+# --- Backend Selection ---
+
+def _check_backend(name):
+    if name is None:
+        return None
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}; expected one of {BACKENDS}")
+    if name == "compiled" and not _kernels().HAVE_NUMBA:
+        raise ValueError("The 'compiled' backend needs Numba ('pip install classical-quantum-sim[jit]')")
+    return name
+
+@functools.lru_cache(maxsize=1)
+def _environment_backend():
+    return _check_backend(os.environ.get(BACKEND_ENV) or None)
+
+def forced_backend():
+    """Backend forced by `use_backend` / `set_backend` or the environment (None if not forced)."""
+    return _forced_backend.get() or _environment_backend()
+
+def set_backend(name) -> None:
+    """Forces a batch backend for this thread / context (None restores automatic selection)."""
+    _forced_backend.set(_check_backend(name))
+
+@contextlib.contextmanager
+def use_backend(name):
+    """Context manager forcing a batch backend inside its block."""
+    token = _forced_backend.set(_check_backend(name))
+    try:
+        yield
+    finally:
+        _forced_backend.reset(token)
+
+def available_backends(op: str, states, *args) -> tuple:
+    """Batch backends able to run `op` on `states` (with the given extra arguments)."""
+    names = ["numpy"]
+    if _lut().supports(states) and (not args or all(_batch().np.ndim(arg) == 0 for arg in args)):
+        names.append("lut")
+    if _kernels().supports(states):
+        names.append("compiled")
+    return tuple(names)
+
+def select_backend(op: str, states, *args) -> str:
+    """Returns the batch backend used for `op` on `states` (see module docs)."""
+    available = available_backends(op, states, *args)
+    forced = forced_backend()
+    if forced is not None:
+        return forced if forced in available else "numpy"
+    thresholds = _thresholds().get(op)
+    if thresholds:
+        sizes, backends = thresholds
+        backend = backends[max(bisect.bisect_right(sizes, states.size) - 1, 0)]
+        if backend in available:
+            return backend
+    return next(name for name in _PREFERENCE if name in available)
+
+
+# --- Calibration ---
+
+def cache_path() -> str:
+    """Location of the calibration cache file."""
+    path = os.environ.get(CACHE_ENV)
+    if path:
+        return path
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "classical_quantum_sim", "dispatch.json")
+
+@functools.lru_cache(maxsize=1)
+def load_profile() -> dict:
+    """Returns the calibration profile ({} if there is none); read once per process."""
+    try:
+        with open(cache_path(), encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return profile if profile.get("version") == PROFILE_VERSION else {}
+
+@functools.lru_cache(maxsize=1)
+def _thresholds() -> dict:
+    """Op -> (min sizes, backends) from the profile, ready for bisection."""
+    return {op: ([size for size, _ in entries], [backend for _, backend in entries])
+            for op, entries in load_profile().get("ops", {}).items()}
+
+def reload() -> None:
+    """Re-reads the backend environment variable and the calibration cache."""
+    _environment_backend.cache_clear()
+    load_profile.cache_clear()
+    _thresholds.cache_clear()
+
+def _time(function, size: int, repeat: int) -> float:
+    """Best time per call in seconds."""
+    function() # Warm-up: builds lookup tables, loads compiled kernels
+    number = max(1, min(_CALIBRATION_ELEMENTS // size, _CALIBRATION_MAX_CALLS))
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+def calibrate(sizes=CALIBRATION_SIZES, repeat: int = 3, path=None, verbose: bool = False) -> dict:
+    """
+    Times every batch backend for each calibrated op and size and caches the fastest.
+
+    Args:
+        sizes: Batch sizes to time (ascending).
+        repeat: Timing samples per measurement (the best is kept).
+        path: Cache file to write (default: `cache_path()`).
+        verbose: Print each timing as it is measured.
+
+    Returns:
+        The profile written: for each op a list of [min_size, backend]
+        pairs, where a backend is used from min_size up to the next entry.
+    """
+    batch = _batch()
+    np = batch.np
+    rng = np.random.default_rng(0)
+    ws = batch.Workspace(seed=0)
+    ops = {}
+    for op in CALIBRATED_OPS:
+        implementations = _implementations(op)
+        thresholds = []
+        for size in sizes:
+            states = rng.integers(0, 1 << 16, size, dtype=batch.STATE_DTYPE)
+            out = np.empty_like(states)
+            if op == "apply_PhaseShift_sim":
+                calls = {name: functools.partial(f, states, _CALIBRATION_ANGLE, out, ws)
+                         for name, f in implementations.items()}
+            elif op == "measure":
+                outcomes = np.empty(size, dtype=batch.OUTCOME_DTYPE)
+                calls = {name: (lambda f=f: f(states, ws.uniform(states.shape), out, outcomes, ws))
+                         for name, f in implementations.items()}
+            elif op == "get_probability_p1":
+                probs = np.empty(size, dtype=np.float64)
+                calls = {name: functools.partial(f, states, probs, ws) for name, f in implementations.items()}
+            else:
+                calls = {name: functools.partial(f, states, out, ws) for name, f in implementations.items()}
+            timings = {name: _time(calls[name], size, repeat)
+                       for name in available_backends(op, states, _CALIBRATION_ANGLE)}
+            best = min(timings, key=timings.get)
+            if verbose:
+                print(f"{op:22} {size:>8} " + " ".join(f"{n}={t * 1e6:.2f}us" for n, t in timings.items()))
+            if not thresholds or thresholds[-1][1] != best:
+                thresholds.append([size if thresholds else 0, best])
+        ops[op] = thresholds
+
+    kernels = _kernels()
+    profile = {
+        "version": PROFILE_VERSION,
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": kernels.numba.__version__ if kernels.HAVE_NUMBA else None,
+        "ops": ops,
+    }
+    path = path or cache_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+    os.replace(temporary, path) # Atomic, so concurrent readers never see a partial file
+    reload()
+    return profile
+
+
+# --- Dispatched Functions ---
+
+def _is_scalar(qsim) -> bool:
+    # Exact ints skip the slower ABC check (the common case of a single state)
+    return type(qsim) is int or isinstance(qsim, numbers.Integral)
+
+def _workspace(workspace, session):
+    return workspace if workspace is not None else resolve_session(session).workspace
+
+def _run_batch(op: str, states, args: tuple, out, workspace, session):
+    batch = _batch()
+    states = batch._as_states(states)
+    backend = select_backend(op, states, *args)
+    ws = _workspace(workspace, session) # Scratch buffers (NumPy path) and the trajectory recorder
+    out = _implementations(op)[backend](states, *args, out, ws)
+    return batch._recorded(ws, out, op) if op in batch.CIRCUIT_GATES else out # Gates only, not decoders
+
+def _measure_batch(states, out, outcomes, workspace, sampling: str, session) -> tuple:
+    batch = _batch()
+    states = batch._as_states(states)
+    ws = _workspace(workspace, session)
+    draws = ws.uniform(states.shape, sampling)
+    collapse = _implementations("measure")[select_backend("measure", states)]
+    outcomes, collapsed = collapse(states, draws, out, outcomes, ws)
+    batch._recorded(ws, collapsed, "measure")
+    return outcomes, collapsed
+
+def initialize(basis_state: int = STATE_ZERO, shape=None, out=None, dtype=None):
+    """
+    `gates.initialize`, or `batch.initialize` when `shape` or `out` is given.
+
+    Returns:
+        A packed state (int) or a batch of them.
+    """
+    if shape is None and out is None:
+        return gates.initialize(basis_state)
+    batch = _batch()
+    return batch.initialize(shape, basis_state, out=out, dtype=dtype or batch.STATE_DTYPE)
+
+def initialize_phase_aware(basis_state: int = STATE_ZERO, initial_phase_index: int = DEFAULT_PHASE_INDEX,
+                           shape=None, out=None, dtype=None):
+    """`phase_gates.initialize_phase_aware`, batched when `shape` or `out` is given."""
+    if shape is None and out is None:
+        return phase_gates.initialize_phase_aware(basis_state, initial_phase_index)
+    batch = _batch()
+    return batch.initialize_phase_aware(shape, basis_state, initial_phase_index,
+                                        out=out, dtype=dtype or batch.STATE_DTYPE)
+
+def get_basis_state(qsim, out=None):
+    """Basis state (0 or 1) of a packed state or of every element of a batch."""
+    if type(qsim) is int:
+        return encoding.get_basis_state(qsim)
+    if _is_scalar(qsim):
+        return encoding.get_basis_state(int(qsim))
+    return _batch().get_basis_state(qsim, out=out)
+
+def get_probability_p1(qsim, out=None):
+    """P(|1>) of a packed state or of every element of a batch."""
+    if type(qsim) is int:
+        return encoding.get_probability_p1(qsim)
+    if _is_scalar(qsim):
+        return encoding.get_probability_p1(int(qsim))
+    return _run_batch("get_probability_p1", qsim, (), out, None, None)
+
+def get_phase_index(qsim, out=None):
+    """Phase index (0-15) of a packed state or of every element of a batch."""
+    if type(qsim) is int:
+        return phase_encoding.get_phase_index(qsim)
+    if _is_scalar(qsim):
+        return phase_encoding.get_phase_index(int(qsim))
+    return _batch().get_phase_index(qsim, out=out)
+
+def apply_H_sim(qsim, out=None, workspace=None, session=None):
+    """`gates.apply_H_sim` on a packed state, or `batch.apply_H_sim` on a batch."""
+    if type(qsim) is int:
+        return gates.apply_H_sim(qsim, session=session)
+    if _is_scalar(qsim):
+        return gates.apply_H_sim(int(qsim), session=session)
+    return _run_batch("apply_H_sim", qsim, (), out, workspace, session)
+
+def apply_H_phase_aware(qsim, out=None, workspace=None, session=None):
+    """`phase_gates.apply_H_phase_aware` on a packed state or a batch."""
+    if type(qsim) is int:
+        return phase_gates.apply_H_phase_aware(qsim, session=session)
+    if _is_scalar(qsim):
+        return phase_gates.apply_H_phase_aware(int(qsim), session=session)
+    return _run_batch("apply_H_phase_aware", qsim, (), out, workspace, session)
+
+def apply_PhaseShift_sim(qsim, angle_rad, out=None, workspace=None, session=None):
+    """`phase_gates.apply_PhaseShift_sim` on a packed state or a batch."""
+    if type(qsim) is int:
+        return phase_gates.apply_PhaseShift_sim(qsim, angle_rad)
+    if _is_scalar(qsim):
+        return phase_gates.apply_PhaseShift_sim(int(qsim), angle_rad)
+    return _run_batch("apply_PhaseShift_sim", qsim, (angle_rad,), out, workspace, session)
+
+def measure(qsim, out=None, outcomes=None, workspace=None, sampling: str = "iid", session=None) -> tuple:
+    """
+    Measures a packed state (`gates.measure`) or a batch (`batch.measure`).
+
+    A single state takes one draw from the session's generator, which is
+    uniform under every sampling mode, so `sampling` only affects batches.
+
+    Returns:
+        A tuple (outcome, collapsed_state) or, for a batch, (outcomes, collapsed_states).
+    """
+    if type(qsim) is int:
+        return gates.measure(qsim, session=session)
+    if _is_scalar(qsim):
+        return gates.measure(int(qsim), session=session)
+    return _measure_batch(qsim, out, outcomes, workspace, sampling, session)
+
+def measure_phase_aware(qsim, out=None, outcomes=None, workspace=None, sampling: str = "iid",
+                        session=None) -> tuple:
+    """Phase-aware `measure` (collapsed states get the default phase)."""
+    if type(qsim) is int:
+        return phase_gates.measure_phase_aware(qsim, session=session)
+    if _is_scalar(qsim):
+        return phase_gates.measure_phase_aware(int(qsim), session=session)
+    return _measure_batch(qsim, out, outcomes, workspace, sampling, session)
+
+def create_bell_pair_sim(type: str = 'phi+', session=None) -> tuple:
+    """`entanglement.create_bell_pair_sim` (pairs are created one at a time)."""
+    return entanglement.create_bell_pair_sim(type, session=session)
+
+def measure_bell(qsim_a, qsim_b, bell_type: str = 'phi+', pair_id: str = None, out_a=None, out_b=None,
+                 outcomes=None, workspace=None, sampling: str = "iid", session=None) -> tuple:
+    """
+    Measures Bell pairs: `entanglement.measure_bell_pair_sim` for a single
+    pair, `batch.measure_bell` for batches of pairs.
+
+    Returns:
+        A tuple (outcome_a, collapsed_a, collapsed_b), batched for batches.
+    """
+    if _is_scalar(qsim_a) and _is_scalar(qsim_b):
+        return entanglement.measure_bell_pair_sim(int(qsim_a), int(qsim_b), bell_type,
+                                                  pair_id=pair_id, session=session)
+    session = resolve_session(session)
+    result = _batch().measure_bell(qsim_a, qsim_b, bell_type, out_a=out_a, out_b=out_b, outcomes=outcomes,
+                                   workspace=_workspace(workspace, session), sampling=sampling)
+    if pair_id is not None:
+        session.release_pair(pair_id)
+    return result
+
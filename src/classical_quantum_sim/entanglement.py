@@ -1,16 +1,4 @@
-# src/classical_ adding the given angle to the current phase.
-
-    Args:
-        qsim_int: The input phase-aware simulated qubit integer.
-        angle_rad: The phase shift angle in radians.
-
-    Returns:
-        A new integer representing the state after the phase shift.
-    """
-    current_phase_idx = get_phase_index(qsim_int)
-    angle_delta_idx = _radians_to_phase_index(angle_rad) # Get index corresponding to shift
-
-    new_phase_idx = (current_phase_idx + angle_delta_idx) % NUM_quantum_sim/entanglement.py
+# src/classical_quantum_sim/entanglement.py
 
 """
 Provides functions to simulate classical correlations analogous to entanglement
@@ -18,51 +6,116 @@ between pairs of simulated qubits.
 
 Limitations:
 - This is *classical correlation*, not true quantum entanglement.
-- Relies on shared IDs and potentially external state management.
-- Current version uses simplified state settingPHASE_STEPS
-    return set_phase_index(qsim_int, new_phase_idx)
-
-
-def measure_phase_aware(qsim_int: int) -> tuple[int, int]:
-    """
-    Simulates measuring the phase-aware qubit.
-
-    Measurement for Bell pairs.
+- Relies on shared IDs; pairs are stored in the `Session` passed in (or the
+  current session, see `session.current_session`), never in module globals.
+- Current version uses simplified state setting for Bell pairs.
 - Assumes 16-bit integers; might need adaptation for phase AND entanglement IDs.
   (Maybe use higher bits if available, or require 32-bit ints, or manage IDs externally)
 """
-import random
 import uuid # For generating unique pair IDs
 
-# Use outcome depends only on probability.
-    The collapsed state has probability 1.0 for the outcome and its
-    phase is reset to the default (index 0).
+# Use phase-aware gates as the basis for entanglement
+from .phase_gates import initialize_phase_aware, measure_phase_aware
+from .phase_encoding import (
+    set_prob_and_phase, get_probability_p1, phase_qsim_repr,
+    STATE_ZERO, STATE_ONE
+)
+from .session import current_session, resolve_session
+# Need functions to store/retrieve pair ID in reserved bits (Placeholder - Assume external for now)
+# from .phase_encoding import set_pair_id, get_pair_id # These don't exist yet!
+
+
+# --- Pair storage lives in each Session (Session.pairs); nothing is module-global.
+
+def __getattr__(name):
+    # Backwards compatibility: the old module-level registry is the current session's store
+    if name == "entangled_pairs_registry":
+        return current_session().pairs
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# --- Entanglement Functions ---
+
+def _generate_pair_id() -> str:
+    """Generates a unique ID for an entangled pair."""
+    return str(uuid.uuid4())
+
+def create_bell_pair_sim(type: str = 'phi+', session=None) -> tuple[int, int, str]:
+    """
+    Creates two simulated qubit integers linked to represent a Bell state correlation.
 
     Args:
-        qsim_int: The input phase-aware simulated qubit integer.
+        type (str): The type of Bell state correlation to simulate.
+                    Supported: 'phi+' (|00>+|11>), 'phi-' (|00>-|11>),
+                               'psi+' (|01>+|10>), 'psi-' (|01>-|10>).
+                               Phase differences ('phi-'/'psi-') are currently ignored.
+        session: `Session` whose pair store records the pair
+                 (default: `current_session()`).
 
     Returns:
-        A tuple containing phase-aware gates as the basis for entanglement
-from .phase_gates import initialize_phase_aware, measure_phase_aware
-from .phase_encoding import (
-    set_prob_and_phase, get_probability_p1, phase_qsim_repr,
-    STATE_ZERO:
-            - outcome (int): The measured basis state (0 or 1).
-            - collapsed_qsim_int (int): The new phase-aware integer representing
-                                         the qubit after collapse (with default phase).
+        tuple[int, int, str]: (qsim_int_A, qsim_int_B, pair_id)
+                              The two integers representing the linked qubits and their shared ID.
     """
-    prob_p1 = get_probability_p1(qsim_int)
-    random_draw = random.random()
+    if type not in ['phi+', 'phi-', 'psi+', 'psi-']:
+        raise ValueError("Unsupported Bell state type")
 
-    outcome = STATE_ONE if random_draw < prob_p1 else STATE_ZERO
+    pair_id = _generate_pair_id()
 
-    # Create the new integer representing the collapsed state with default phase
-    collapsed_qsim_int = initialize_phase_aware(basis, STATE_ONE
-)
-# Need functions to store/retrieve pair ID in reserved bits (Placeholder - Assume external for now)
-# from .phase_encoding import set_pair_id, get_pair_id # These don't exist yet!
+    # Initialize both qubits. For Bell states, measuring one determines the other.
+    # The internal probability before measurement should reflect equal chances.
+    # We'll set both to P=0.5, phase=0 for simplicity. The correlation logic
+    # is handled during the entangled measurement.
+    # NOTE: This doesn't perfectly represent the superposition weights of |00>, |11> etc.
+    qsim_int_A = initialize_phase_aware(STATE_ZERO, 0) # Start definite
+    qsim_int_A = set_prob_and_phase(qsim_int_A, 0.5, 0.0) # Set to 50/50 superposition
+
+    qsim_int_B = initialize_phase_aware(STATE_ZERO, 0)
+    qsim_int_B = set_prob_and_phase(qsim_int_B, 0.5, 0.0)
 
+    # TODO: Store pair_id *within* qsim_int_A and qsim_int_B using reserved bits.
+    # This requires defining set_pair_id/get_pair_id in an encoding module.
+    # For now, the link exists only in the registry.
 
-# --- Global state for managing entangled pairs (_state=outcome, initial_phase_index=DEFAULT_PHASE_INDEX)
+    # Store the pair information
+    session = resolve_session(session)
+    session.register_pair(pair_id, {
+        'qA_ref': id(qsim_int_A), # Store object ID (won't work for updates) - illustrates limitation
+        'qB_ref': id(qsim_int_B),
+        'bell_type': type
+    })
+    session.diagnostics.count("bell_pair")
+    session.diagnostics.debug(f"Created Bell pair {pair_id} type {type}. Pairs in session: {len(session.pairs)}")
 
-    return outcome, collapsed_qsim_int
+
+    # Problem: Need a way to associate the returned integers with the pair_id externally
+    # or embed it in the integers themselves (see entanglement_encoding).
+    return qsim_int_A, qsim_int_B, pair_id
+
+
+def measure_bell_pair_sim(qsim_int_A: int, qsim_int_B: int, type: str = 'phi+',
+                          pair_id: str = None, session=None) -> tuple[int, int, int]:
+    """
+    Measures qubit A of a simulated Bell pair and collapses partner B accordingly.
+
+    'phi' pairs give B the same outcome as A, 'psi' pairs the opposite one
+    (phase differences are ignored, as in `create_bell_pair_sim`).
+
+    Args:
+        qsim_int_A: The qubit that is measured.
+        qsim_int_B: Its partner (only replaced by the collapsed state).
+        type (str): The Bell state type the pair was created with.
+        pair_id: If given, the pair is removed from the session's store.
+        session: `Session` supplying the draw and the pair store
+                 (default: `current_session()`).
+
+    Returns:
+        tuple[int, int, int]: (outcome_A, collapsed_A, collapsed_B)
+    """
+    if type not in ['phi+', 'phi-', 'psi+', 'psi-']:
+        raise ValueError("Unsupported Bell state type")
+    session = resolve_session(session)
+    outcome_A, collapsed_A = measure_phase_aware(qsim_int_A, session=session)
+    outcome_B = outcome_A if type.startswith('phi') else STATE_ONE - outcome_A
+    collapsed_B = initialize_phase_aware(outcome_B, 0)
+    if pair_id is not None:
+        session.release_pair(pair_id)
+    return outcome_A, collapsed_A, collapsed_B
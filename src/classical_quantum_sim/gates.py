@@ -4,12 +4,12 @@
 Implements simulated quantum gates operating on the classical integer representation.
 """
 
-import random
 from .encoding import (
     STATE_ZERO, STATE_ONE,
     get_probability_p1, set_probability_p1,
     set_basis_state, MAX_PROB_AMP_INT, _probability_to_int
 )
+from .session import resolve_session
 
 def initialize(basis_state: int = STATE_ZERO) -> int:
     """
@@ -36,7 +36,7 @@ def initialize(basis_state: int = STATE_ZERO) -> int:
 
     return qsim_int
 
-def apply_H_sim(qsim_int: int) -> int:
+def apply_H_sim(qsim_int: int, session=None) -> int:
     """
     Applies a simulated Hadamard gate.
     Transforms |0> -> (|0> + |1>)/sqrt(2)  => P(0)=0.5, P(1)=0.5
@@ -49,6 +49,8 @@ def apply_H_sim(qsim_int: int) -> int:
 
     Args:
         qsim_int: The input simulated qubit integer.
+        session: `Session` that records the warning for a non-definite
+                 input (default: `current_session()`).
 
     Returns:
         A new integer representing the state after the simulated H gate.
@@ -65,11 +67,12 @@ def apply_H_sim(qsim_int: int) -> int:
         # Simplest MVP: H on superposition does nothing or returns to some state.
         # Let's assume for now it just stays in the same probabilistic state.
         # A more complex model could track phase or use different logic.
-        print("Warning: Simulated H applied to non-definite state. Behavior is simplified.")
+        resolve_session(session).diagnostics.warn(
+            "Simulated H applied to non-definite state. Behavior is simplified.")
         return qsim_int
 
 
-def measure(qsim_int: int) -> tuple[int, int]:
+def measure(qsim_int: int, session=None) -> tuple[int, int]:
     """
     Simulates measuring the qubit.
 
@@ -78,6 +81,8 @@ def measure(qsim_int: int) -> tuple[int, int]:
 
     Args:
         qsim_int: The input simulated qubit integer.
+        session: `Session` whose generator supplies the random draw
+                 (default: `current_session()`).
 
     Returns:
         A tuple containing:
@@ -86,9 +91,11 @@ def measure(qsim_int: int) -> tuple[int, int]:
                                          qubit after collapse.
     """
     prob_p1 = get_probability_p1(qsim_int)
+    session = resolve_session(session)
+    session.diagnostics.count("measure")
 
     # Perform probabilistic collapse
-    random_draw = random.random() # Random float between 0.0 and 1.0
+    random_draw = session.rng.random() # Random float between 0.0 and 1.0
 
     if random_draw < prob_p1:
         # Collapse to |1>
@@ -0,0 +1,258 @@
+# src/classical_quantum_sim/jobs.py
+
+"""
+Batched job execution behind the `classical-quantum-sim` command (see `cli`).
+
+`parse_job` turns one JSON line into a `Job` and its batch key,
+`run_batch` simulates a group of jobs sharing a gate sequence (in a worker
+process or in-process), and `Runner` groups jobs, keeps memory bounded
+and streams the results.
+"""
+
+import inspect
+import json
+import math
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError as exc: # The command needs the optional NumPy dependency
+    raise ImportError(
+        "classical-quantum-sim requires NumPy. "
+        "Install it with 'pip install classical-quantum-sim[batch]'."
+    ) from exc
+
+from . import batch
+from .phase_gates import DEFAULT_PHASE_INDEX, initialize_phase_aware
+from .sampling import SAMPLING_MODES, count_ones
+from .shared import DEFAULT_CHUNK_SIZE
+
+DEFAULT_SHOTS = 1024
+DEFAULT_BATCH_SIZE = 256 # Jobs per batch
+DEFAULT_LINGER = 0.05 # Seconds a partial batch waits for more jobs
+POLL_INTERVAL = 0.01 # Seconds between checks for finished batches while input is idle
+
+# Extra arguments of each circuit gate (all angles), besides states, out and workspace
+_GATE_ARGUMENTS = {name: len(inspect.signature(gate).parameters) - 3
+                   for name, gate in batch.CIRCUIT_GATES.items()}
+
+
+class Job(NamedTuple):
+    """A parsed job; only these plain values are sent to the workers."""
+    id: object
+    initial_state: int
+    phase_deltas: tuple # Quantized angle of every gate argument, in circuit order
+    shots: int
+    seed: object
+
+
+def load_spec(line: str) -> dict:
+    """
+    Decodes one input line into a job spec.
+
+    Raises:
+        ValueError: If the line is not a JSON object.
+    """
+    try:
+        spec = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON: {exc}") from None
+    if not isinstance(spec, dict):
+        raise ValueError("A job must be a JSON object")
+    return spec
+
+def parse_job(spec: dict, job_id) -> tuple:
+    """
+    Validates a job spec (see `load_spec`).
+
+    Returns:
+        A tuple (batch_key, job), where batch_key is the (gate names,
+        sampling) pair shared by jobs that can run in the same batch. Gate
+        angles are not part of the key: they are quantized into the job.
+
+    Raises:
+        ValueError, TypeError: If the spec is not a valid job.
+    """
+    if "circuit" not in spec:
+        raise ValueError("Missing 'circuit'")
+    circuit = tuple(batch.resolve_circuit(
+        step if isinstance(step, str) else tuple(step) for step in spec["circuit"]))
+    for name, args in circuit:
+        if len(args) != _GATE_ARGUMENTS[name]:
+            raise ValueError(f"{name} takes {_GATE_ARGUMENTS[name]} argument(s), got {len(args)}")
+        for arg in args:
+            if isinstance(arg, bool) or not isinstance(arg, (int, float)) or not math.isfinite(arg):
+                raise ValueError(f"Arguments of {name} must be finite numbers, got {arg!r}")
+    sampling = spec.get("sampling", "iid")
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode {sampling!r}; expected one of {SAMPLING_MODES}")
+    shots = spec.get("shots", DEFAULT_SHOTS)
+    if isinstance(shots, bool) or not isinstance(shots, int) or shots < 0:
+        raise ValueError("'shots' must be a non-negative integer")
+    initial_state = initialize_phase_aware(
+        spec.get("basis_state", 0), spec.get("initial_phase_index", DEFAULT_PHASE_INDEX))
+    seed = spec.get("seed")
+    np.random.SeedSequence(seed) # Rejects invalid seeds here rather than in a worker
+    gates = tuple(name for name, _ in circuit)
+    # Only the quantized phase delta of an angle affects the simulation
+    phase_deltas = tuple(batch._phase_delta(arg) for _, args in circuit for arg in args)
+    job = Job(job_id, initial_state, phase_deltas, shots, seed)
+    return (gates, sampling), job
+
+
+def run_batch(gates, sampling: str, jobs, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list:
+    """
+    Runs a group of jobs sharing a gate sequence (worker entry point).
+
+    The gates are applied once to a batch holding every job's initial
+    state, each gate argument taking an array of the jobs' angles; each job's shots are then counted with `sampling.count_ones`,
+    drawing at most `chunk_size` at a time from a generator seeded from
+    the job alone. Neither grouping nor `chunk_size` changes the results.
+
+    Returns:
+        A list of result dicts, in the order of `jobs`.
+    """
+    states = np.array([job.initial_state for job in jobs], dtype=batch.STATE_DTYPE)
+    # Exact multiples of the phase step, so the gates quantize them back to the same deltas
+    angles = np.array([job.phase_deltas for job in jobs], dtype=np.int64).reshape(len(jobs), -1)
+    angles = angles * batch.RADIANS_PER_STEP
+    circuit, column = [], 0
+    for name in gates:
+        count = _GATE_ARGUMENTS[name]
+        circuit.append((name, tuple(angles[:, column:column + count].T)))
+        column += count
+    batch.apply_circuit(states, circuit, out=states, workspace=batch.Workspace())
+    state_p1 = batch.get_probability_p1(states)
+
+    results = []
+    for job, state, p1 in zip(jobs, states.tolist(), state_p1.tolist()):
+        ones = count_ones(p1, job.shots, sampling, np.random.default_rng(job.seed), chunk_size)
+        results.append({
+            "id": job.id,
+            "shots": job.shots,
+            "ones": ones,
+            "p1": ones / job.shots if job.shots else None,
+            "state": state,
+            "state_p1": p1,
+        })
+    return results
+
+
+class Runner:
+    """Groups parsed jobs into batches, runs them and streams the results."""
+
+    def __init__(self, output, workers: int, batch_size: int, max_buffered: int,
+                 max_pending: int, chunk_size: int, linger: float = DEFAULT_LINGER):
+        self.output = output
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_buffered = max_buffered
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        self.executor = ProcessPoolExecutor(workers) if workers else None
+        self.groups = {} # batch_key -> list of buffered jobs, oldest group first
+        self.deadlines = {} # batch_key -> time.monotonic() by which the group is sent
+        self.buffered = 0
+        self.pending = {} # future -> jobs
+        self.jobs = self.errors = self.batches = self.shots = 0
+
+    def add_line(self, line: str, line_number: int) -> None:
+        """
+        Parses and buffers one input line, or writes its error result.
+
+        Errors are reported under the job's "id" when the line is a JSON
+        object, and under the line number otherwise.
+        """
+        try:
+            spec = load_spec(line)
+        except ValueError as exc:
+            self.error(line_number, str(exc))
+            return
+        job_id = spec.get("id", line_number)
+        try:
+            key, job = parse_job(spec, job_id)
+        except (ValueError, TypeError) as exc:
+            self.error(job_id, str(exc))
+            return
+        self.add(key, job)
+
+    def add(self, key, job: Job) -> None:
+        """Buffers a job, submitting batches once they are full."""
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = []
+            self.deadlines[key] = time.monotonic() + self.linger
+        group.append(job)
+        self.buffered += 1
+        if len(group) >= self.batch_size:
+            self._submit(key)
+        elif self.buffered >= self.max_buffered:
+            # Too many jobs waiting in small groups: send the largest one
+            self._submit(max(self.groups, key=lambda k: len(self.groups[k])))
+        self.poll()
+
+    def poll(self) -> None:
+        """Sends partial batches that have lingered too long and writes finished results."""
+        now = time.monotonic()
+        # Groups are created in deadline order, so only the oldest ones need checking
+        while self.groups and self.deadlines[next(iter(self.groups))] <= now:
+            self._submit(next(iter(self.groups)))
+        if any(future.done() for future in self.pending):
+            self._collect(FIRST_COMPLETED)
+
+    def timeout(self):
+        """Seconds the caller may wait for input before calling `poll` (None: no limit)."""
+        if self.groups:
+            return max(self.deadlines[next(iter(self.groups))] - time.monotonic(), 0.0)
+        return POLL_INTERVAL if self.pending else None
+
+    def error(self, job_id, message: str) -> None:
+        """Writes an error result for a job that could not be run."""
+        self._write([{"id": job_id, "error": message}])
+
+    def _submit(self, key) -> None:
+        jobs = self.groups.pop(key)
+        del self.deadlines[key]
+        self.buffered -= len(jobs)
+        self.batches += 1
+        gates, sampling = key
+        if self.executor is None:
+            self._finish(jobs, lambda: run_batch(gates, sampling, jobs, self.chunk_size))
+            return
+        while len(self.pending) >= self.max_pending:
+            self._collect(FIRST_COMPLETED)
+        future = self.executor.submit(run_batch, gates, sampling, jobs, self.chunk_size)
+        self.pending[future] = jobs
+
+    def _collect(self, return_when) -> None:
+        done, _ = wait(self.pending, return_when=return_when)
+        for future in done:
+            self._finish(self.pending.pop(future), future.result)
+
+    def _finish(self, jobs, get_results) -> None:
+        try:
+            results = get_results()
+        except Exception as exc: # Report the failure for every job of the batch and carry on
+            results = [{"id": job.id, "error": f"{type(exc).__name__}: {exc}"} for job in jobs]
+        self._write(results)
+
+    def _write(self, results) -> None:
+        for result in results:
+            if "error" in result:
+                self.errors += 1
+            else:
+                self.shots += result["shots"]
+            self.jobs += 1
+            self.output.write(json.dumps(result) + "\n")
+        self.output.flush()
+
+    def close(self) -> None:
+        """Submits the remaining partial batches and waits for every result."""
+        for key in list(self.groups):
+            self._submit(key)
+        if self.pending:
+            self._collect(ALL_COMPLETED)
+        if self.executor is not None:
+            self.executor.shutdown()
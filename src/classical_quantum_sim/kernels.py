@@ -0,0 +1,190 @@
+# src/classical_quantum_sim/kernels.py
+
+"""
+Optional compiled element-wise kernels for the encode/decode helpers,
+the H and phase gates, and measurement.
+
+When Numba is installed every kernel below is compiled with
+`numba.vectorize` into a true NumPy ufunc on first access (so importing
+this module costs no compilation), and it broadcasts over arrays of
+packed states, accepts `out=` (including `out=` the input for in-place
+updates) and runs as a single fused loop with no temporaries. Without Numba
+the very same kernel bodies are exported as plain Python functions that work
+on scalar ints, so the import names are identical on every install:
+
+    from classical_quantum_sim import kernels
+    p1 = kernels.get_probability_p1(states)          # ufunc or scalar function
+    kernels.apply_H_phase_aware(states, out=states)   # in place (Numba only)
+
+Differences from the scalar API in `encoding`, `gates` and `phase_gates`:
+- Kernels never raise or print. `set_phase_index` wraps the index modulo 16
+  and `apply_H_sim` leaves superposition inputs unchanged without a warning.
+- Ufuncs cannot own random state or return tuples, so `measure` takes the
+  uniform random draw explicitly and returns only the collapsed state.
+  The outcome is `get_basis_state(collapsed)`.
+
+Supported state dtypes for the compiled ufuncs: uint16, int32 and int64
+(check with `supports`; `batch` uses NumPy operations for other dtypes).
+
+The compiled loops are nopython code that never touches Python objects, and
+NumPy releases the GIL around ufunc inner loops on numeric dtypes, so
+threads calling kernels on separate arrays run in parallel.
+"""
+
+import math
+import threading
+
+from .encoding import (
+    BASIS_STATE_SHIFT, BASIS_STATE_MASK, STATE_ZERO, STATE_ONE,
+    PROB_AMP_SHIFT, PROB_AMP_MASK, MAX_PROB_AMP_INT,
+    _probability_to_int
+)
+from .phase_encoding import PHASE_SHIFT, PHASE_MASK, NUM_PHASE_STEPS, RADIANS_PER_STEP
+from .gates import initialize
+
+try:
+    import numba
+except ImportError: # Optional dependency: fall back to the pure-Python kernels
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+# --- Precomputed Constants (frozen into the compiled kernels) ---
+_TWO_PI = 2 * math.pi
+_H_PROB_BITS = _probability_to_int(0.5) << PROB_AMP_SHIFT # P(|1>)=0.5 field
+_H_PHASE_DELTA = NUM_PHASE_STEPS // 2 # pi radians
+_COLLAPSED_ZERO = initialize(STATE_ZERO) # Same values as initialize_phase_aware(x, 0)
+_COLLAPSED_ONE = initialize(STATE_ONE)
+
+# --- Ufunc Signatures ---
+_STATE_TYPES = ("uint16", "int32", "int64")
+_SIG_STATE_TO_STATE = [f"{t}({t})" for t in _STATE_TYPES]
+_SIG_STATE_TO_FLOAT = [f"float64({t})" for t in _STATE_TYPES]
+_SIG_STATE_FLOAT_TO_STATE = [f"{t}({t}, float64)" for t in _STATE_TYPES]
+_SIG_STATE_INT_TO_STATE = [f"{t}({t}, int64)" for t in _STATE_TYPES]
+
+
+def supports(states) -> bool:
+    """Whether the compiled ufuncs can process `states` in its own dtype (needs Numba)."""
+    dtype = getattr(states, "dtype", None)
+    return HAVE_NUMBA and dtype is not None and dtype.name in _STATE_TYPES
+
+# Kernels awaiting compilation: name -> (py_func, signatures), or the name it aliases
+_PENDING = {}
+_compile_lock = threading.RLock()
+
+def _kernel(signatures):
+    """Registers a scalar kernel for compilation into a NumPy ufunc if Numba is available."""
+    def decorator(py_func):
+        if numba is not None:
+            _PENDING[py_func.__name__] = (py_func, signatures)
+        return py_func
+    return decorator
+
+def __getattr__(name):
+    """Compiles a registered kernel on first access and caches the ufunc in the module."""
+    if name not in _PENDING:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _compile_lock:
+        if name not in globals():
+            pending = _PENDING[name]
+            if isinstance(pending, str): # Alias: share the other kernel's ufunc
+                globals()[name] = __getattr__(pending)
+            else:
+                py_func, signatures = pending
+                compiled = numba.vectorize(signatures, nopython=True, cache=True)(py_func)
+                # Newer Numba wraps the result in a DUFunc; expose the plain np.ufunc
+                globals()[name] = getattr(compiled, "ufunc", compiled)
+    return globals()[name]
+
+def __dir__():
+    return sorted(set(globals()) | set(_PENDING))
+
+# --- Encode / Decode Kernels ---
+
+@_kernel(_SIG_STATE_TO_STATE)
+def get_basis_state(qsim_int):
+    """Extracts the basis state (0 or 1) from the packed state."""
+    return (qsim_int & BASIS_STATE_MASK) >> BASIS_STATE_SHIFT
+
+@_kernel(_SIG_STATE_TO_FLOAT)
+def get_probability_p1(qsim_int):
+    """Extracts P(|1>) as a float in [0.0, 1.0]."""
+    return ((qsim_int & PROB_AMP_MASK) >> PROB_AMP_SHIFT) / MAX_PROB_AMP_INT
+
+@_kernel(_SIG_STATE_FLOAT_TO_STATE)
+def set_probability_p1(qsim_int, probability_p1):
+    """Sets P(|1>) from a float, clamped to [0.0, 1.0] and quantized to 10 bits."""
+    clamped_prob = min(1.0, max(0.0, probability_p1))
+    prob_int = int(round(clamped_prob * MAX_PROB_AMP_INT))
+    return (qsim_int & ~PROB_AMP_MASK) | (prob_int << PROB_AMP_SHIFT)
+
+@_kernel(_SIG_STATE_TO_STATE)
+def get_phase_index(qsim_int):
+    """Extracts the phase index (0-15) from the packed state."""
+    return (qsim_int & PHASE_MASK) >> PHASE_SHIFT
+
+@_kernel(_SIG_STATE_INT_TO_STATE)
+def set_phase_index(qsim_int, phase_index):
+    """Sets the phase index bits; the index is wrapped modulo 16."""
+    return (qsim_int & ~PHASE_MASK) | ((phase_index % NUM_PHASE_STEPS) << PHASE_SHIFT)
+
+# --- Gate Kernels ---
+
+@_kernel(_SIG_STATE_TO_STATE)
+def apply_H_sim(qsim_int):
+    """Simulated Hadamard (probability only): definite states go to P(|1>)=0.5."""
+    prob_int = (qsim_int & PROB_AMP_MASK) >> PROB_AMP_SHIFT
+    if prob_int == 0 or prob_int == MAX_PROB_AMP_INT:
+        return (qsim_int & ~PROB_AMP_MASK) | _H_PROB_BITS
+    return qsim_int
+
+@_kernel(_SIG_STATE_TO_STATE)
+def apply_H_phase_aware(qsim_int):
+    """Phase-aware Hadamard: P(|1>)=0.5, plus a pi phase shift if the input was |1>."""
+    prob_int = (qsim_int & PROB_AMP_MASK) >> PROB_AMP_SHIFT
+    updated_int = (qsim_int & ~PROB_AMP_MASK) | _H_PROB_BITS
+    if prob_int == MAX_PROB_AMP_INT:
+        phase_idx = (((qsim_int & PHASE_MASK) >> PHASE_SHIFT) + _H_PHASE_DELTA) % NUM_PHASE_STEPS
+        updated_int = (updated_int & ~PHASE_MASK) | (phase_idx << PHASE_SHIFT)
+    return updated_int
+
+@_kernel(_SIG_STATE_FLOAT_TO_STATE)
+def apply_PhaseShift_sim(qsim_int, angle_rad):
+    """Adds a phase shift, quantized to the nearest of the 16 phase steps."""
+    # Inlined _radians_to_phase_index (compiled kernels cannot call Python helpers)
+    angle_delta_idx = int(round((angle_rad % _TWO_PI) / RADIANS_PER_STEP)) % NUM_PHASE_STEPS
+    phase_idx = (((qsim_int & PHASE_MASK) >> PHASE_SHIFT) + angle_delta_idx) % NUM_PHASE_STEPS
+    return (qsim_int & ~PHASE_MASK) | (phase_idx << PHASE_SHIFT)
+
+@_kernel(_SIG_STATE_INT_TO_STATE)
+def shift_phase_index(qsim_int, phase_delta):
+    """Adds an already quantized phase index delta (see `batch._phase_delta`)."""
+    phase_idx = (((qsim_int & PHASE_MASK) >> PHASE_SHIFT) + phase_delta) % NUM_PHASE_STEPS
+    return (qsim_int & ~PHASE_MASK) | (phase_idx << PHASE_SHIFT)
+
+# --- Measurement Kernels ---
+
+@_kernel(_SIG_STATE_FLOAT_TO_STATE)
+def measure(qsim_int, random_draw):
+    """
+    Collapses the state given a uniform draw in [0.0, 1.0).
+
+    Returns the collapsed state (P=1.0, phase index 0); the outcome is its basis state.
+    """
+    prob_p1 = ((qsim_int & PROB_AMP_MASK) >> PROB_AMP_SHIFT) / MAX_PROB_AMP_INT
+    if random_draw < prob_p1:
+        return _COLLAPSED_ONE
+    return _COLLAPSED_ZERO
+
+# Phase-aware measurement collapses to the same integers (phase reset to index 0)
+measure_phase_aware = measure
+if numba is not None:
+    _PENDING["measure_phase_aware"] = "measure"
+
+def _defer_compilation():
+    """With Numba, drops the Python kernels so that the first access compiles them."""
+    for name in _PENDING:
+        del globals()[name]
+
+_defer_compilation()
@@ -0,0 +1,104 @@
+# src/classical_quantum_sim/lut.py
+
+"""
+Lookup-table implementations of the batched gates and decoders.
+
+A packed state is a 16-bit integer, so every deterministic per-state
+function is fully described by a 65536-entry table: a gate becomes a
+single `np.take` gather (128 KiB table for uint16 results, 512 KiB for
+P(|1>)). Tables are built on first use from the NumPy path in `batch`,
+so they match it bit for bit, and are cached read-only for the process.
+
+Phase shifts quantize to one of 16 deltas, so `apply_PhaseShift_sim`
+keeps one table per delta and only supports scalar angles.
+
+Only uint16 batches can index the tables directly; use `supports` to
+check (the `dispatch` layer does).
+"""
+
+import functools
+
+import numpy as np
+
+from . import batch
+
+NUM_STATES = 1 << 16 # Every possible packed state
+
+
+def supports(states) -> bool:
+    """Whether `states` can be processed with table lookups (uint16 only)."""
+    return getattr(states, "dtype", None) == batch.STATE_DTYPE
+
+def _take(table: np.ndarray, states, out) -> np.ndarray:
+    states = batch._as_states(states)
+    if not supports(states):
+        raise TypeError(f"Lookup tables need {np.dtype(batch.STATE_DTYPE)} states, got {states.dtype}")
+    out = batch._output(states, out, table.dtype)
+    # mode="clip" avoids NumPy's buffered bounds check; uint16 indices are always in range
+    return np.take(table, states, out=out, mode="clip")
+
+def _frozen(table: np.ndarray) -> np.ndarray:
+    table.flags.writeable = False
+    return table
+
+
+# --- Tables ---
+
+@functools.lru_cache(maxsize=None)
+def _all_states() -> np.ndarray:
+    return _frozen(np.arange(NUM_STATES, dtype=batch.STATE_DTYPE))
+
+@functools.lru_cache(maxsize=None)
+def gate_table(name: str, phase_delta: int = 0) -> np.ndarray:
+    """Result of a gate for every packed state (read-only uint16 table)."""
+    states, ws = _all_states(), batch.Workspace()
+    if name == "apply_H_sim":
+        table = batch._apply_H_sim_numpy(states, None, ws)
+    elif name == "apply_H_phase_aware":
+        table = batch._apply_H_phase_aware_numpy(states, None, ws)
+    elif name == "apply_PhaseShift_sim":
+        table = batch._apply_PhaseShift_sim_numpy(states, phase_delta * batch.RADIANS_PER_STEP, None, ws)
+    else:
+        raise ValueError(f"No lookup table for gate {name!r}")
+    return _frozen(table)
+
+@functools.lru_cache(maxsize=None)
+def probability_table() -> np.ndarray:
+    """P(|1>) for every packed state (read-only float64 table)."""
+    return _frozen(batch._get_probability_p1_numpy(_all_states(), None))
+
+
+# --- Gates and Decoders ---
+
+def apply_H_sim(states, out=None) -> np.ndarray:
+    """Lookup-table `batch.apply_H_sim`."""
+    return _take(gate_table("apply_H_sim"), states, out)
+
+def apply_H_phase_aware(states, out=None) -> np.ndarray:
+    """Lookup-table `batch.apply_H_phase_aware`."""
+    return _take(gate_table("apply_H_phase_aware"), states, out)
+
+def apply_PhaseShift_sim(states, angle_rad: float, out=None) -> np.ndarray:
+    """Lookup-table `batch.apply_PhaseShift_sim` (scalar angles only)."""
+    if np.ndim(angle_rad) != 0:
+        raise ValueError("Lookup-table phase shifts need a scalar angle")
+    return _take(gate_table("apply_PhaseShift_sim", batch._phase_delta(angle_rad)), states, out)
+
+def get_probability_p1(states, out=None) -> np.ndarray:
+    """Lookup-table `batch.get_probability_p1`."""
+    return _take(probability_table(), states, out)
+
+
+# --- Measurement ---
+
+def collapse(states, draws, out, outcomes, ws) -> tuple:
+    """`batch._collapse` with P(|1>) gathered from the probability table."""
+    outcomes = batch._output(states, outcomes, batch.OUTCOME_DTYPE)
+    out = batch._output(states, out)
+    probs = get_probability_p1(states, out=ws.buffer_like("probs", states, np.float64))
+    is_one = ws.mask_like(states)
+    np.less(draws, probs, out=is_one)
+    out.fill(batch._COLLAPSED_ZERO)
+    np.copyto(out, batch._COLLAPSED_ONE, where=is_one)
+    np.copyto(outcomes, is_one, casting="unsafe")
+    return outcomes, out
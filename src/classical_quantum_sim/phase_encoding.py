@@ -35,7 +35,54 @@ def _radians_to_phase_index(angle_rad: float) -> int:
     """Converts an angle in radians [0, 2pi) to the nearest phase index (0-15)."""
     # Normalize angle to [0, 2pi)
     normalized_angle = angle_rad % (2 * math.pi)
-    if(qsim_int)
+    # Round to the nearest step and wrap index 16 back to 0
+    return int(round(normalized_angle / RADIANS_PER_STEP)) % NUM_PHASE_STEPS
+
+def _phase_index_to_radians(phase_index: int) -> float:
+    """Converts a phase index (0-15) to its angle in radians."""
+    return (phase_index % NUM_PHASE_STEPS) * RADIANS_PER_STEP
+
+def get_phase_index(qsim_int: int) -> int:
+    """Extracts the phase index (0-15) from the integer representation."""
+    return (qsim_int & PHASE_MASK) >> PHASE_SHIFT
+
+def set_phase_index(qsim_int: int, phase_index: int) -> int:
+    """
+    Sets the phase index bits (0-15) in the integer representation.
+    Returns a *new* integer with the updated phase.
+    """
+    if not (0 <= phase_index < NUM_PHASE_STEPS):
+        raise ValueError(f"Phase index must be between 0 and {NUM_PHASE_STEPS-1}")
+
+    # Clear the current phase bits
+    cleared_int = qsim_int & ~PHASE_MASK
+    # Set the new phase bits
+    updated_int = cleared_int | (phase_index << PHASE_SHIFT)
+    return updated_int
+
+def get_phase_radians(qsim_int: int) -> float:
+    """Extracts the phase and converts it to radians [0, 2pi)."""
+    return _phase_index_to_radians(get_phase_index(qsim_int))
+
+def set_phase_radians(qsim_int: int, angle_rad: float) -> int:
+    """
+    Sets the phase bits from an angle in radians (quantized to the nearest step).
+    Returns a *new* integer with the updated phase.
+    """
+    return set_phase_index(qsim_int, _radians_to_phase_index(angle_rad))
+
+def set_prob_and_phase(qsim_int: int, probability_p1: float, angle_rad: float) -> int:
+    """
+    Sets both the probability P(|1>) and the phase (in radians) in one call.
+    Returns a *new* integer with the updated fields.
+    """
+    updated_int = set_probability_p1(qsim_int, probability_p1)
+    return set_phase_radians(updated_int, angle_rad)
+
+def phase_qsim_repr(qsim_int: int) -> str:
+    """Provides a human-readable string representation including phase information."""
+    basis = get_basis_state(qsim_int)
+    prob_p1 = get_probability_p1(qsim_int)
     prob_p0 = 1.0 - prob_p1
     phase_rad = get_phase_radians(qsim_int)
     phase_deg = math.degrees(phase_rad)
@@ -51,3 +98,6 @@ def _radians_to_phase_index(angle_rad: float) -> int:
 
     return (f"PhaseQSim(Int={qsim_int:5d}, Bin={qsim_int:016b}, State={state_str}, "
             f"P(|0>)={prob_p0:.3f}, P(|1>)={prob_p1:.3f}, {phase_info})")
+
+# Alias kept for callers using the older name
+qsim_phase_repr = phase_qsim_repr
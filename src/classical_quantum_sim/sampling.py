@@ -0,0 +1,193 @@
+# src/classical_quantum_sim/sampling.py
+
+"""
+Variance-reduction sampling modes for measurement shots.
+
+A shot collapses to |1> when its uniform draw falls below the stored
+threshold P(|1>) = ProbInt / 1023. Independent draws need O(1/eps^2) shots
+to estimate P(|1>) to precision eps; spreading the draws evenly over
+[0, 1) reaches the same precision with far fewer shots.
+
+Modes (the `sampling=` option of `batch.measure` and `batch.measure_bell`):
+- "iid": independent uniform draws (the behaviour of `gates.measure`).
+- "antithetic": draws come in pairs u and 1 - u.
+- "stratified": one draw per equal-width stratum of [0, 1). With n
+  strata the count below any threshold is off by at most one, so the
+  standard error is at most 1/(2n) instead of sqrt(p(1-p)/n).
+- "sobol": a randomly shifted 1-D Sobol (base-2 van der Corput) sequence.
+
+In the batched measurement each lane still gets exactly one uniform
+draw; stratified and Sobol draws are assigned to lanes in random order.
+`estimate_p1` runs independent replicates of a mode and reports the
+estimate together with its standard error. `count_ones` counts the |1>
+outcomes of many shots of one state in bounded memory, with a result that
+does not depend on the chunk size.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .encoding import PROB_AMP_SHIFT, PROB_AMP_MASK, MAX_PROB_AMP_INT
+
+SAMPLING_MODES = ("iid", "antithetic", "stratified", "sobol")
+DEFAULT_REPLICATES = 8
+
+_SOBOL_BITS = 32
+
+
+def _check_mode(sampling: str) -> None:
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode {sampling!r}; expected one of {SAMPLING_MODES}")
+
+def _van_der_corput(n: int, start: int = 0) -> np.ndarray:
+    """Points start..start+n-1 of the base-2 radical inverse as 32-bit integers (bit-reversed indices)."""
+    x = np.arange(start, start + n, dtype=np.uint64)
+    x = ((x >> 1) & 0x55555555) | ((x & 0x55555555) << 1)
+    x = ((x >> 2) & 0x33333333) | ((x & 0x33333333) << 2)
+    x = ((x >> 4) & 0x0F0F0F0F) | ((x & 0x0F0F0F0F) << 4)
+    x = ((x >> 8) & 0x00FF00FF) | ((x & 0x00FF00FF) << 8)
+    return ((x >> 16) | (x << 16)) & 0xFFFFFFFF
+
+def fill_uniform(out: np.ndarray, sampling: str, rng: np.random.Generator, shuffle: bool = True) -> np.ndarray:
+    """
+    Fills a float64 array with uniform draws in [0.0, 1.0) using a sampling mode.
+
+    Args:
+        out: Contiguous float64 array to fill in place (any shape; filled in flat order).
+        sampling: One of SAMPLING_MODES.
+        rng: Source of randomness.
+        shuffle: Assign stratified/Sobol points to positions in random order,
+                 so no position is biased towards low or high draws.
+
+    Returns:
+        `out`.
+    """
+    _check_mode(sampling)
+    flat = out.reshape(-1)
+    n = flat.size
+    if sampling == "iid":
+        rng.random(out=flat)
+    elif sampling == "antithetic":
+        half = (n + 1) // 2
+        rng.random(out=flat[:half])
+        # Position i is paired with position i + half
+        np.subtract(1.0, flat[:n - half], out=flat[half:])
+    elif sampling == "stratified":
+        rng.random(out=flat)
+        strata = rng.permutation(n) if shuffle else np.arange(n)
+        flat += strata
+        flat /= n
+    else: # sobol
+        # Random digital shift (XOR) plus a jitter within the finest cell
+        shifted = _van_der_corput(n) ^ np.uint64(rng.integers(0, 1 << _SOBOL_BITS))
+        points = (shifted + rng.random(n)) * 2.0 ** -_SOBOL_BITS
+        flat[:] = rng.permutation(points) if shuffle else points
+    return out
+
+
+def count_ones(p1: float, shots: int, sampling: str, rng: np.random.Generator,
+               chunk_size: int = None) -> int:
+    """
+    Counts the |1> outcomes of measuring one state `shots` times.
+
+    Draws are generated `chunk_size` at a time, but every mode is laid out
+    over all of the shots, so the count depends only on `rng`, never on
+    the chunk size: iid and jitter draws are consumed in order, stratified
+    draws use the job-wide strata (i + u) / shots, Sobol draws one shift
+    for the whole sequence, and antithetic pairs never straddle a chunk.
+
+    Args:
+        p1: P(|1>) of the state (e.g. from `batch.get_probability_p1`).
+        shots: Number of measurements.
+        sampling: One of SAMPLING_MODES.
+        rng: Source of randomness.
+        chunk_size: Draws generated at a time (None: all at once).
+
+    Returns:
+        The number of draws below `p1`.
+    """
+    _check_mode(sampling)
+    chunk_size = chunk_size or max(shots, 1)
+    if sampling == "antithetic":
+        chunk_size = max(chunk_size - chunk_size % 2, 2) # Whole pairs per chunk
+    shift = np.uint64(rng.integers(0, 1 << _SOBOL_BITS)) if sampling == "sobol" else None
+    buffer = np.empty(min(chunk_size, shots), dtype=np.float64)
+    ones = 0
+    for start in range(0, shots, chunk_size):
+        draws = buffer[:min(chunk_size, shots - start)]
+        if sampling == "antithetic":
+            # Draw i is paired with draw i + half; an odd last draw stays unpaired
+            half = (draws.size + 1) // 2
+            rng.random(out=draws[:half])
+            np.subtract(1.0, draws[:draws.size - half], out=draws[half:])
+        else:
+            rng.random(out=draws)
+        if sampling == "stratified":
+            draws += np.arange(start, start + draws.size)
+            draws /= shots
+        elif sampling == "sobol":
+            draws += _van_der_corput(draws.size, start) ^ shift
+            draws *= 2.0 ** -_SOBOL_BITS
+        ones += int(np.count_nonzero(draws < p1))
+    return ones
+
+
+class Estimate(NamedTuple):
+    """
+    Shot-based estimate of P(|1>) per state.
+
+    Attributes:
+        p1: Estimated P(|1>) (array shaped like the input states).
+        stderr: Standard error of `p1`, from the spread of the replicates.
+        shots: Total shots per state (replicates * shots per replicate).
+        sampling: The sampling mode used.
+    """
+    p1: np.ndarray
+    stderr: np.ndarray
+    shots: int
+    sampling: str
+
+
+def estimate_p1(states, shots: int, sampling: str = "stratified",
+                replicates: int = DEFAULT_REPLICATES, seed=None, rng=None) -> Estimate:
+    """
+    Estimates P(|1>) of each state from `shots` simulated measurements.
+
+    The shots are split into `replicates` independent randomizations of the
+    chosen mode; the standard error comes from their spread. The same
+    draws are shared by all states in a replicate (common random numbers),
+    so cost is O(shots log shots + states) rather than O(shots * states).
+
+    Args:
+        states: Packed state (int) or array of packed states.
+        shots: Total measurements per state.
+        sampling: One of SAMPLING_MODES.
+        replicates: Independent replicates (at least 2 for an error estimate).
+        seed: Seed for a new generator (ignored if `rng` is given).
+        rng: Existing `numpy.random.Generator`.
+
+    Returns:
+        An `Estimate`.
+    """
+    _check_mode(sampling)
+    if replicates < 2:
+        raise ValueError("At least 2 replicates are needed for an error estimate")
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    states = np.asarray(states)
+    prob_p1 = ((states & PROB_AMP_MASK) >> PROB_AMP_SHIFT) / MAX_PROB_AMP_INT
+    per_replicate = max(1, -(-shots // replicates))
+
+    draws = np.empty(per_replicate, dtype=np.float64)
+    estimates = np.empty((replicates,) + states.shape, dtype=np.float64)
+    for r in range(replicates):
+        fill_uniform(draws, sampling, rng, shuffle=False)
+        draws.sort()
+        # Number of draws strictly below each threshold = number of |1> outcomes
+        estimates[r] = np.searchsorted(draws, prob_p1, side="left") / per_replicate
+    return Estimate(
+        p1=estimates.mean(axis=0),
+        stderr=estimates.std(axis=0, ddof=1) / np.sqrt(replicates),
+        shots=per_replicate * replicates,
+        sampling=sampling,
+    )
@@ -0,0 +1,185 @@
+# src/classical_quantum_sim/session.py
+
+"""
+Simulation sessions: per-context random state, Bell pair store and diagnostics.
+
+Scalar measurement, Bell pair creation and gate warnings used to share
+the global `random` state and the module-global `entangled_pairs_registry`,
+so threads contended on (and raced over) the same objects. Every piece of
+mutable simulation state now lives in a `Session`:
+
+- `rng`: a `random.Random` for scalar measurement draws.
+- `pairs`: the Bell pair store (pair ID -> pair info).
+- `diagnostics`: counters and recent warning / debug messages.
+- `workspace`: a `batch.Workspace` for batched operations, one per thread
+  (needs NumPy).
+
+Functions that draw, register pairs or warn take an optional `session=`.
+Without one they use `current_session()`: the session activated with
+`with session:` in the current context, otherwise a default session
+created on first use in each thread. Threads therefore never share state
+unless a session is passed to them explicitly.
+
+A shared session stays correct: the pair store is locked, event counters
+are kept per thread and merged on read, `random.Random` is thread-safe
+and every thread gets its own workspace
+(the first one seeded with `seed`, later ones with independent child
+seeds, so their draws depend on the order threads first use it). Its lock
+and generator are still contended; give each thread its own session for
+throughput and reproducibility.
+
+Example:
+    with Session(seed=42) as session:
+        outcome, _ = gates.measure(gates.apply_H_sim(gates.initialize()))
+        session.diagnostics.counters["measure"]  # 1
+"""
+
+import collections
+import contextvars
+import random
+import threading
+
+MAX_MESSAGES = 100 # Recent diagnostics messages kept per session
+
+# Session activated with `with session:`, per context (not inherited by new threads before 3.14)
+_active_session = contextvars.ContextVar("classical_quantum_sim_session", default=None)
+# Reset tokens of the `with session:` blocks open in the current context, innermost last
+_entry_tokens = contextvars.ContextVar("classical_quantum_sim_session_tokens", default=())
+# Implicit default session of each thread
+_thread_defaults = threading.local()
+
+
+class Diagnostics:
+    """
+    Event counters and the most recent messages of a session.
+
+    Counting is lock-free: each thread increments its own `Counter`, and
+    `counters` merges them when read.
+
+    Attributes:
+        counters: `collections.Counter` of event name -> count
+                  (e.g. "measure", "bell_pair", "warning"), summed over threads.
+        messages: The last MAX_MESSAGES (level, message) tuples.
+        echo_warnings: Print warnings as they are recorded (the historic behaviour).
+        echo_debug: Print debug messages as they are recorded.
+    """
+
+    def __init__(self, echo_warnings: bool = True, echo_debug: bool = False):
+        self.messages = collections.deque(maxlen=MAX_MESSAGES)
+        self.echo_warnings = echo_warnings
+        self.echo_debug = echo_debug
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_counters = [] # Counter of every thread that counted, kept after it exits
+
+    @property
+    def counters(self) -> collections.Counter:
+        """Event counts summed over all threads (a new `Counter` on every read)."""
+        with self._lock:
+            thread_counters = list(self._thread_counters)
+        total = collections.Counter()
+        for counter in thread_counters:
+            total.update(counter.copy()) # Copy: the owning thread may be adding events
+        return total
+
+    def count(self, event: str, n: int = 1) -> None:
+        """Adds `n` to the counter of `event`."""
+        counter = getattr(self._local, "counter", None)
+        if counter is None:
+            counter = self._local.counter = collections.Counter()
+            with self._lock:
+                self._thread_counters.append(counter)
+        counter[event] += n
+
+    def warn(self, message: str) -> None:
+        """Records (and by default prints) a warning."""
+        self._record("warning", message, self.echo_warnings)
+
+    def debug(self, message: str) -> None:
+        """Records a debug message (printed only if `echo_debug` is set)."""
+        self._record("debug", message, self.echo_debug)
+
+    def _record(self, level: str, message: str, echo: bool) -> None:
+        self.count(level)
+        with self._lock:
+            self.messages.append((level, message))
+        if echo:
+            print(f"{level.capitalize()}: {message}")
+
+
+class Session:
+    """
+    Owns the mutable state of a simulation (see module docs).
+
+    Args:
+        seed: Seed for the session's generators (None: seeded from the OS).
+        echo_warnings: Print gate warnings as they occur.
+        echo_debug: Print debug messages (e.g. Bell pair creation).
+    """
+
+    def __init__(self, seed=None, echo_warnings: bool = True, echo_debug: bool = False):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.pairs = {}
+        self.diagnostics = Diagnostics(echo_warnings, echo_debug)
+        self._pairs_lock = threading.Lock()
+        self._workspaces = threading.local() # Scratch buffers are per thread
+        self._workspace_lock = threading.Lock()
+        self._workspace_count = 0
+
+    @property
+    def workspace(self):
+        """This thread's `batch.Workspace` of the session, created on first use."""
+        workspace = getattr(self._workspaces, "workspace", None)
+        if workspace is None:
+            import numpy as np # NumPy is optional; only needed for batched use
+            from . import batch
+            with self._workspace_lock:
+                index = self._workspace_count
+                self._workspace_count += 1
+            seed = self.seed
+            if index and seed is not None:
+                # Independent child stream for every thread after the first
+                seed = np.random.SeedSequence(seed, spawn_key=(index,))
+            workspace = self._workspaces.workspace = batch.Workspace(seed=seed)
+        return workspace
+
+    def register_pair(self, pair_id: str, info: dict) -> None:
+        """Adds a Bell pair to this session's store."""
+        with self._pairs_lock:
+            self.pairs[pair_id] = info
+
+    def release_pair(self, pair_id: str) -> dict:
+        """Removes a pair from the store and returns its info (None if unknown)."""
+        with self._pairs_lock:
+            return self.pairs.pop(pair_id, None)
+
+    def __enter__(self) -> "Session":
+        # Tokens belong to the entering context, so they are kept per context
+        # rather than on the session, which several threads may enter at once
+        token = _active_session.set(self)
+        _entry_tokens.set(_entry_tokens.get() + (token,))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        tokens = _entry_tokens.get()
+        _entry_tokens.set(tokens[:-1])
+        _active_session.reset(tokens[-1])
+
+    def __repr__(self) -> str:
+        return f"Session(seed={self.seed!r}, pairs={len(self.pairs)})"
+
+
+def current_session() -> Session:
+    """Returns the session active in this context, or this thread's default session."""
+    session = _active_session.get()
+    if session is not None:
+        return session
+    session = getattr(_thread_defaults, "session", None)
+    if session is None:
+        session = _thread_defaults.session = Session()
+    return session
+
+def resolve_session(session=None) -> Session:
+    """Returns `session` if given, otherwise `current_session()`."""
+    return session if session is not None else current_session()
@@ -0,0 +1,198 @@
+# src/classical_quantum_sim/shared.py
+
+"""
+Shared-memory batches for multi-process simulation without pickling states.
+
+A `SharedBatch` places the packed uint16 states and a bit-packed outcome
+buffer (one bit per qubit, little bit order) in a single
+`multiprocessing.shared_memory` block. Workers receive only a small
+`SliceDescriptor` (block name, batch size, dtype, lane range), attach to
+the block, apply the circuit to their slice in place and write measurement
+outcomes straight into the shared bit buffer. Slice boundaries are aligned
+to multiples of 8 lanes so no two workers ever write the same outcome byte.
+
+Example:
+    with SharedBatch.create(10**8) as shared:
+        run_parallel(shared, [phase_gates.apply_H_phase_aware], seed=42)
+        ones = int(np.unpackbits(shared.outcome_bits).sum())
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from . import batch
+from .encoding import STATE_ZERO
+
+# Lanes processed per step inside a worker (bounds per-worker scratch memory)
+DEFAULT_CHUNK_SIZE = 1 << 20
+_BITS_PER_BYTE = 8
+
+
+class SliceDescriptor(NamedTuple):
+    """Picklable, zero-copy reference to a lane range of a `SharedBatch`."""
+    shm_name: str
+    size: int # Total number of lanes in the shared batch
+    dtype: str
+    start: int
+    stop: int
+
+
+def _packed_size(size: int) -> int:
+    """Number of bytes needed to hold one outcome bit per lane."""
+    return (size + _BITS_PER_BYTE - 1) // _BITS_PER_BYTE
+
+
+class SharedBatch:
+    """
+    A batch of packed states plus bit-packed outcomes in shared memory.
+
+    Use `create` in the parent process and `attach` (or a `SliceDescriptor`)
+    in workers. The creator owns the block and unlinks it on `__exit__`.
+
+    Attributes:
+        states: NumPy view of the packed states (shape `(size,)`).
+        outcome_bits: NumPy uint8 view of the packed outcome bits.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, size: int, dtype=batch.STATE_DTYPE, owner: bool = False):
+        self.shm = shm
+        self.size = size
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        state_bytes = size * self.dtype.itemsize
+        self.states = np.ndarray((size,), dtype=self.dtype, buffer=shm.buf)
+        self.outcome_bits = np.ndarray((_packed_size(size),), dtype=np.uint8,
+                                       buffer=shm.buf, offset=state_bytes)
+
+    @classmethod
+    def create(cls, size: int, basis_state: int = STATE_ZERO, dtype=batch.STATE_DTYPE) -> "SharedBatch":
+        """Allocates a new shared block and initializes every lane to `basis_state`."""
+        nbytes = size * np.dtype(dtype).itemsize + _packed_size(size)
+        shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        shared = cls(shm, size, dtype, owner=True)
+        batch.initialize(size, basis_state, out=shared.states)
+        shared.outcome_bits.fill(0)
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, size: int, dtype=batch.STATE_DTYPE) -> "SharedBatch":
+        """Attaches to an existing shared block created by `create`."""
+        return cls(shared_memory.SharedMemory(name=name), size, dtype)
+
+    def descriptor(self, start: int = 0, stop: int = None) -> SliceDescriptor:
+        """Returns a descriptor for lanes [start, stop)."""
+        stop = self.size if stop is None else stop
+        return SliceDescriptor(self.shm.name, self.size, self.dtype.str, start, stop)
+
+    def split(self, parts: int) -> list:
+        """Splits the batch into at most `parts` descriptors with byte-aligned boundaries."""
+        step = -(-self.size // max(parts, 1)) # Ceiling division
+        step = max(-(-step // _BITS_PER_BYTE) * _BITS_PER_BYTE, _BITS_PER_BYTE)
+        return [self.descriptor(start, min(start + step, self.size))
+                for start in range(0, self.size, step)]
+
+    def outcomes(self) -> np.ndarray:
+        """Unpacks the outcome bits into a new uint8 array (one element per lane)."""
+        return np.unpackbits(self.outcome_bits, count=self.size, bitorder="little")
+
+    def close(self) -> None:
+        """Releases this process's views and handle (the block stays alive)."""
+        # The views must go first, or SharedMemory.close() sees exported buffers
+        self.states = None
+        self.outcome_bits = None
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """Destroys the shared block (call once, from the creating process)."""
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+# --- Worker Side ---
+
+def run_slice(descriptor: SliceDescriptor, circuit, measure: bool = True,
+              seed=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Applies `circuit` in place to one slice of a shared batch (worker entry point).
+
+    Args:
+        descriptor: The lane range to process.
+        circuit: Gates to apply (see `batch.resolve_circuit`).
+        measure: Whether to measure afterwards, collapsing the states and
+                 writing the outcome bits into the shared buffer.
+        seed: Seed (or `numpy.random.SeedSequence`) for this slice's draws.
+        chunk_size: Lanes processed at a time; rounded up to a multiple of 8.
+
+    Returns:
+        Number of |1> outcomes in the slice (0 if `measure` is False).
+    """
+    if descriptor.start % _BITS_PER_BYTE:
+        raise ValueError("Slice start must be a multiple of 8 lanes")
+    circuit = batch.resolve_circuit(circuit)
+    chunk_size = -(-chunk_size // _BITS_PER_BYTE) * _BITS_PER_BYTE
+    workspace = batch.Workspace(seed=seed)
+    shared = SharedBatch.attach(descriptor.shm_name, descriptor.size, descriptor.dtype)
+    ones = 0
+    try:
+        for start in range(descriptor.start, descriptor.stop, chunk_size):
+            stop = min(start + chunk_size, descriptor.stop)
+            states = shared.states[start:stop]
+            batch.apply_circuit(states, circuit, out=states, workspace=workspace)
+            if measure:
+                outcomes = workspace.buffer_like("outcomes", states, batch.OUTCOME_DTYPE)
+                batch.measure(states, out=states, outcomes=outcomes, workspace=workspace)
+                packed = np.packbits(outcomes, bitorder="little")
+                shared.outcome_bits[start // _BITS_PER_BYTE:start // _BITS_PER_BYTE + packed.size] = packed
+                ones += int(np.count_nonzero(outcomes))
+            del states
+    finally:
+        shared.close()
+    return ones
+
+
+def _run_slice_star(args) -> int:
+    """Unpacks arguments for `Pool.imap_unordered`."""
+    return run_slice(*args)
+
+
+# --- Parent Side ---
+
+def run_parallel(shared: SharedBatch, circuit, measure: bool = True, seed=None,
+                 processes: int = None, pool=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Runs `circuit` over a shared batch with a process pool, in place.
+
+    Only slice descriptors, gate names and seeds cross the process boundary.
+
+    Args:
+        shared: The batch to process.
+        circuit: Gates to apply (see `batch.resolve_circuit`).
+        measure: Whether to measure into `shared.outcome_bits` afterwards.
+        seed: Root seed; each slice gets an independent child stream.
+        processes: Number of worker processes (default: CPU count).
+        pool: Optional existing `multiprocessing.Pool` to reuse across runs.
+        chunk_size: Lanes processed at a time inside each worker.
+
+    Returns:
+        Total number of |1> outcomes (0 if `measure` is False).
+    """
+    circuit = batch.resolve_circuit(circuit)
+    workers = processes or multiprocessing.cpu_count()
+    descriptors = shared.split(workers)
+    seeds = np.random.SeedSequence(seed).spawn(len(descriptors))
+    tasks = [(d, circuit, measure, s, chunk_size) for d, s in zip(descriptors, seeds)]
+
+    if pool is not None:
+        return sum(pool.imap_unordered(_run_slice_star, tasks))
+    with multiprocessing.Pool(workers) as own_pool:
+        return sum(own_pool.imap_unordered(_run_slice_star, tasks))
@@ -0,0 +1,166 @@
+# src/classical_quantum_sim/sweep.py
+
+"""
+Vectorized parameter sweeps over phase angles and initial states.
+
+Every angle passed to `apply_PhaseShift_sim` is quantized to one of 16
+phase steps, so a fine angle grid contains very few distinct circuits.
+`sweep` quantizes each parameter axis on its own, evaluates only the
+distinct combinations as one broadcast batch, and expands the results back
+to the full grid with a single gather:
+
+    result = sweep(
+        [phase_gates.apply_H_phase_aware,
+         (phase_gates.apply_PhaseShift_sim, Param("theta")),
+         phase_gates.apply_H_phase_aware],
+        axes={"basis_state": [0, 1], "theta": np.linspace(0, 2 * np.pi, 10**6)},
+        shots=1000, seed=7,
+    )
+    result.p1.shape        # (2, 1000000), same as the grid
+    result.num_distinct    # 2 * 16 evaluated points
+
+Axis names:
+- "basis_state": initial basis state (0 or 1) for `initialize_phase_aware`.
+- "initial_phase_index": initial phase index (0-15).
+- Any other name is an angle in radians, referenced in the circuit as `Param(name)`.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from . import batch
+from .encoding import STATE_ZERO, STATE_ONE
+from .phase_encoding import NUM_PHASE_STEPS, RADIANS_PER_STEP
+from .phase_gates import DEFAULT_PHASE_INDEX, initialize_phase_aware
+
+BASIS_AXIS = "basis_state"
+PHASE_INDEX_AXIS = "initial_phase_index"
+
+# Every possible initial state, indexed by [basis_state, initial_phase_index]
+_INITIAL_STATES = np.array(
+    [[initialize_phase_aware(basis, index) for index in range(NUM_PHASE_STEPS)]
+     for basis in (STATE_ZERO, STATE_ONE)],
+    dtype=batch.STATE_DTYPE,
+)
+
+
+class Param:
+    """Placeholder for a swept angle in a circuit step, e.g. `(apply_PhaseShift_sim, Param("theta"))`."""
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Param({self.name!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Param) and other.name == self.name
+
+    def __hash__(self) -> int:
+        return hash((Param, self.name))
+
+
+class SweepResult(NamedTuple):
+    """
+    Results of a sweep; every array has the grid shape (one dimension per axis, in order).
+
+    Attributes:
+        axes: The axis names and their values, as passed in.
+        states: Final packed state at each grid point (before measurement).
+        p1: Final P(|1>) at each grid point.
+        counts: Number of |1> outcomes in `shots` measurements per grid point
+                (None if shots was 0).
+        shots: Shots per grid point.
+        num_distinct: Number of distinct points actually simulated.
+    """
+    axes: dict
+    states: np.ndarray
+    p1: np.ndarray
+    counts: np.ndarray
+    shots: int
+    num_distinct: int
+
+
+def _axis_codes(name: str, values: np.ndarray) -> np.ndarray:
+    """Maps one axis's values to the integer codes that determine the simulation."""
+    if name == BASIS_AXIS:
+        if not np.isin(values, (STATE_ZERO, STATE_ONE)).all():
+            raise ValueError("basis_state values must be STATE_ZERO (0) or STATE_ONE (1)")
+        return values.astype(np.int64)
+    if name == PHASE_INDEX_AXIS:
+        if not ((values >= 0) & (values < NUM_PHASE_STEPS)).all():
+            raise ValueError(f"initial_phase_index values must be 0-{NUM_PHASE_STEPS-1}")
+        return values.astype(np.int64)
+    return batch._phase_delta(values.astype(np.float64))
+
+
+def sweep(circuit, axes: dict, shots: int = 0, seed=None, workspace=None) -> SweepResult:
+    """
+    Evaluates `circuit` over the Cartesian grid of `axes`, simulating each distinct point once.
+
+    Args:
+        circuit: Gates to apply (see `batch.resolve_circuit`); angle
+                 arguments may be `Param` placeholders naming an axis.
+        axes: Mapping of axis name to a 1-D sequence of values (see module docs).
+        shots: Measurements per grid point; outcome counts are drawn
+               independently for every grid point, duplicates included.
+        seed: Seed for the shot draws (ignored if `workspace` is given;
+              None draws from the current session's workspace).
+        workspace: Optional `batch.Workspace` to run the circuit with.
+
+    Returns:
+        A `SweepResult` with grid-shaped arrays.
+    """
+    circuit = batch.resolve_circuit(circuit)
+    names = list(axes)
+    params = {arg.name for _, args in circuit for arg in args if isinstance(arg, Param)}
+    missing = params - set(names)
+    if missing:
+        raise ValueError(f"Circuit parameters without an axis: {sorted(missing)}")
+    unused = set(names) - params - {BASIS_AXIS, PHASE_INDEX_AXIS}
+    if unused:
+        raise ValueError(f"Axes not used by the circuit: {sorted(unused)}")
+
+    # Deduplicate each axis independently; `inverses` maps grid indices to distinct indices
+    uniques, inverses = [], []
+    for name in names:
+        codes = _axis_codes(name, np.asarray(axes[name]).reshape(-1))
+        unique, inverse = np.unique(codes, return_inverse=True)
+        uniques.append(unique)
+        inverses.append(inverse.reshape(-1))
+
+    def axis_view(name):
+        """Unique codes of one axis, shaped to broadcast along its grid dimension."""
+        i = names.index(name)
+        shape = [1] * len(names)
+        shape[i] = len(uniques[i])
+        return uniques[i].reshape(shape)
+
+    distinct_shape = tuple(len(u) for u in uniques)
+    basis = axis_view(BASIS_AXIS) if BASIS_AXIS in names else STATE_ZERO
+    phase_index = axis_view(PHASE_INDEX_AXIS) if PHASE_INDEX_AXIS in names else DEFAULT_PHASE_INDEX
+    states = np.broadcast_to(_INITIAL_STATES[basis, phase_index], distinct_shape).copy()
+
+    # Bind each Param to its quantized angles (exact multiples of the phase step)
+    angles = {name: axis_view(name) * RADIANS_PER_STEP for name in params}
+    bound = [(name, tuple(angles[a.name] if isinstance(a, Param) else a for a in args))
+             for name, args in circuit]
+    if workspace is None and seed is not None:
+        workspace = batch.Workspace(seed=seed)
+    ws = batch._workspace(workspace)
+    batch.apply_circuit(states, bound, out=states, workspace=ws)
+    p1 = batch.get_probability_p1(states)
+
+    grid_index = np.ix_(*inverses)
+    grid_p1 = p1[grid_index]
+    counts = ws.rng.binomial(shots, grid_p1) if shots else None
+    return SweepResult(
+        axes=dict(axes),
+        states=states[grid_index],
+        p1=grid_p1,
+        counts=counts,
+        shots=shots,
+        num_distinct=int(states.size),
+    )
@@ -0,0 +1,204 @@
+# src/classical_quantum_sim/table.py
+
+"""
+Bulk decoding of packed states into columnar arrays for analysis.
+
+`qsim_repr`, `phase_qsim_repr` and `qsim_ent_repr` build one string per
+qubit, which is far too slow for inspecting hundreds of thousands of
+states. `decode` instead returns a `StateTable` whose columns are NumPy
+arrays, each computed on first access:
+
+    basis, p0, p1, phase_index, phase_radians, ent_id, state_class
+
+`summarize` (or `StateTable.summary()`) skips the per-element columns and
+returns histograms of every field, all derived from a single 65536-bin
+count of the packed integers. Strings are only built on request, for a
+slice, with `StateTable.format`.
+
+Note: the phase index and the entanglement ID share bits 2-5, so the two
+columns decode the same bits under the two different interpretations.
+
+Example:
+    table = decode(states)
+    table.p1.mean(), np.bincount(table.state_class)
+    print("\\n".join(table.format(0, 5, kind="phase")))
+"""
+
+from enum import IntEnum
+from functools import cached_property
+from typing import NamedTuple
+
+import numpy as np
+
+from . import batch
+from .encoding import (
+    BASIS_STATE_SHIFT, BASIS_STATE_MASK, PROB_AMP_SHIFT, PROB_AMP_MASK, MAX_PROB_AMP_INT,
+    qsim_repr
+)
+from .phase_encoding import NUM_PHASE_STEPS, phase_qsim_repr
+from .entanglement_encoding import ENT_ID_SHIFT, ENT_ID_MASK, qsim_ent_repr
+
+_NUM_STATES = 1 << 16 # Every possible packed 16-bit state
+_COUNT_CHUNK = 1 << 20 # bincount casts its input to intp, so count in bounded chunks
+_NUM_PROB_INTS = MAX_PROB_AMP_INT + 1
+_NUM_BASIS_CODES = BASIS_STATE_MASK + 1
+
+_REPR_FUNCTIONS = {
+    "qsim": qsim_repr,
+    "phase": phase_qsim_repr,
+    "ent": qsim_ent_repr,
+}
+
+
+class StateClass(IntEnum):
+    """Classification of a packed state by its stored probability P(|1>)."""
+    ZERO = 0 # Definite |0> (P(|1>) = 0.0)
+    ONE = 1 # Definite |1> (P(|1>) = 1.0)
+    SUPERPOSITION = 2
+
+
+class StateSummary(NamedTuple):
+    """
+    Histograms of every decoded field of a batch.
+
+    Each histogram is an int64 array of counts indexed by the field value:
+    `prob_int` by the 10-bit probability integer (P(|1>) = index / 1023),
+    `basis` by the 2-bit basis code, `phase_index` and `ent_id` by the
+    4-bit field value, and `state_class` by `StateClass`.
+    """
+    total: int
+    basis: np.ndarray
+    prob_int: np.ndarray
+    phase_index: np.ndarray
+    ent_id: np.ndarray
+    state_class: np.ndarray
+
+
+def _check_16_bit(states: np.ndarray) -> None:
+    """Raises ValueError if any value is not a packed 16-bit state (0-65535)."""
+    if states.dtype.kind == "u" and states.dtype.itemsize <= 2 or not states.size:
+        return
+    if states.min() < 0 or states.max() >= _NUM_STATES:
+        raise ValueError(f"Packed states must be 16-bit values (0-{_NUM_STATES - 1})")
+
+def summarize(states) -> StateSummary:
+    """Computes per-field histograms of a batch without decoding every element."""
+    states = batch._as_states(states).ravel()
+    _check_16_bit(states)
+    # Full histogram of the packed integers; every field histogram is a marginal of it
+    counts = np.zeros(_NUM_STATES, dtype=np.int64)
+    for start in range(0, states.size, _COUNT_CHUNK):
+        counts += np.bincount(states[start:start + _COUNT_CHUNK], minlength=_NUM_STATES)[:_NUM_STATES]
+    # Packed layout, high to low bits: probability (10) | phase or ent ID (4) | basis (2)
+    by_field = counts.reshape(_NUM_PROB_INTS, NUM_PHASE_STEPS, _NUM_BASIS_CODES)
+    prob_int = by_field.sum(axis=(1, 2))
+    middle_bits = by_field.sum(axis=(0, 2))
+    state_class = np.array([
+        prob_int[0],
+        prob_int[MAX_PROB_AMP_INT],
+        prob_int[1:MAX_PROB_AMP_INT].sum(),
+    ])
+    return StateSummary(
+        total=int(states.size),
+        basis=by_field.sum(axis=(0, 1)),
+        prob_int=prob_int,
+        phase_index=middle_bits,
+        ent_id=middle_bits.copy(),
+        state_class=state_class,
+    )
+
+
+class StateTable:
+    """
+    Columnar view of a batch of packed states (see `decode`).
+
+    Columns are computed lazily and cached; the input array is not copied.
+    """
+
+    COLUMNS = ("basis", "p0", "p1", "phase_index", "phase_radians", "ent_id", "state_class")
+
+    def __init__(self, states):
+        self.states = batch._as_states(states)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        if column not in self.COLUMNS:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    @cached_property
+    def _prob_int(self) -> np.ndarray:
+        """10-bit probability integer (0-1023)."""
+        return (self.states & PROB_AMP_MASK) >> PROB_AMP_SHIFT
+
+    @cached_property
+    def basis(self) -> np.ndarray:
+        """Basis state bits (uint8)."""
+        return ((self.states & BASIS_STATE_MASK) >> BASIS_STATE_SHIFT).astype(np.uint8)
+
+    @cached_property
+    def p1(self) -> np.ndarray:
+        """P(|1>) as float64."""
+        return batch.get_probability_p1(self.states)
+
+    @cached_property
+    def p0(self) -> np.ndarray:
+        """P(|0>) = 1 - P(|1>) as float64."""
+        return 1.0 - self.p1
+
+    @cached_property
+    def phase_index(self) -> np.ndarray:
+        """Phase index 0-15 (uint8)."""
+        return batch.get_phase_index(self.states).astype(np.uint8)
+
+    @cached_property
+    def phase_radians(self) -> np.ndarray:
+        """Phase angle in radians as float64."""
+        return batch.get_phase_radians(self.states)
+
+    @cached_property
+    def ent_id(self) -> np.ndarray:
+        """Entanglement pair ID 0-15 (uint8; 0 means not entangled)."""
+        return ((self.states & ENT_ID_MASK) >> ENT_ID_SHIFT).astype(np.uint8)
+
+    @cached_property
+    def state_class(self) -> np.ndarray:
+        """`StateClass` code of each row (uint8)."""
+        prob_int = self._prob_int
+        classes = np.full(prob_int.shape, StateClass.SUPERPOSITION, dtype=np.uint8)
+        classes[prob_int == 0] = StateClass.ZERO
+        classes[prob_int == MAX_PROB_AMP_INT] = StateClass.ONE
+        return classes
+
+    def to_dict(self) -> dict:
+        """Returns all columns as a dict of arrays (e.g. for `pandas.DataFrame`)."""
+        return {column: getattr(self, column) for column in self.COLUMNS}
+
+    def summary(self) -> StateSummary:
+        """Per-field histograms of this table's states (see `summarize`)."""
+        return summarize(self.states)
+
+    def format(self, start: int = 0, stop: int = None, kind: str = "qsim") -> list:
+        """
+        Formats only the rows [start, stop) as strings.
+
+        Args:
+            start: First row to format.
+            stop: End of the slice (default: end of the table).
+            kind: 'qsim' (`qsim_repr`), 'phase' (`phase_qsim_repr`) or
+                  'ent' (`qsim_ent_repr`).
+
+        Returns:
+            A list of strings, one per row in the slice.
+        """
+        if kind not in _REPR_FUNCTIONS:
+            raise ValueError(f"Unknown format kind {kind!r}; expected one of {sorted(_REPR_FUNCTIONS)}")
+        repr_function = _REPR_FUNCTIONS[kind]
+        return [repr_function(int(q)) for q in self.states.ravel()[start:stop]]
+
+
+def decode(states) -> StateTable:
+    """Decodes a batch of packed ints into a columnar `StateTable`."""
+    return StateTable(states)
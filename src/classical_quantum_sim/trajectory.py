@@ -0,0 +1,246 @@
+# src/classical_quantum_sim/trajectory.py
+
+"""
+Compact, delta-encoded history of batched state evolution.
+
+A `TrajectoryRecorder` stores the state of every lane (trajectory) after
+every recorded step without keeping a full copy per step:
+
+- A full uint16 copy (keyframe) is stored at least every `keyframe_interval` steps.
+- Other steps store only the lanes that changed, as run-length encoded
+  runs of changed lanes (start, length) plus one uint16 delta per changed
+  lane (new - old, modulo 2^16). Unchanged lanes cost nothing.
+- A step whose runs would take more space than a keyframe (e.g. every
+  other lane changed) is stored as a keyframe instead, so no step ever
+  costs more than 2 bytes per lane.
+
+Recording is opt-in: attach a recorder to the `batch.Workspace` used for
+the circuit and every batched gate and measurement called with that
+workspace records its result. Without a recorder the only cost is one
+attribute check per batched call.
+
+Example:
+    recorder = TrajectoryRecorder(keyframe_interval=32)
+    ws = batch.Workspace(seed=1, recorder=recorder)
+    states = batch.initialize(10**5)
+    recorder.record(states, label="initialize")
+    batch.apply_H_phase_aware(states, out=states, workspace=ws)
+    outcomes, states = batch.measure(states, out=states, workspace=ws)
+    recorder.state_at(step=1, lane=42)  # State of trajectory 42 after H
+    recorder.save("run.npz")
+"""
+
+import bisect
+
+import numpy as np
+
+DELTA_DTYPE = np.uint16 # Packed states are 16-bit, so deltas wrap modulo 2^16
+_RUN_DTYPE = np.uint32
+DEFAULT_KEYFRAME_INTERVAL = 64
+
+
+def _encoded_nbytes(num_runs: int, num_changed: int) -> int:
+    """Size of a run-length encoded step."""
+    return num_runs * 2 * np.dtype(_RUN_DTYPE).itemsize + num_changed * np.dtype(DELTA_DTYPE).itemsize
+
+
+class _DeltaStep:
+    """Changed lanes of one step: run starts/lengths and their uint16 deltas."""
+    __slots__ = ("starts", "lengths", "deltas")
+
+    def __init__(self, starts, lengths, deltas):
+        self.starts = starts
+        self.lengths = lengths
+        self.deltas = deltas
+
+    def _offsets(self) -> np.ndarray:
+        """Index in `deltas` of the first lane of each run (computed, not stored)."""
+        return np.concatenate(([0], np.cumsum(self.lengths[:-1], dtype=np.int64)))
+
+    def delta_for(self, lane: int) -> int:
+        """Returns the delta for one lane (0 if the lane did not change)."""
+        run = int(np.searchsorted(self.starts, lane, side="right")) - 1
+        if run < 0 or lane >= self.starts[run] + self.lengths[run]:
+            return 0
+        offset = int(self.lengths[:run].sum(dtype=np.int64))
+        return int(self.deltas[offset + lane - self.starts[run]])
+
+    def changed_lanes(self) -> np.ndarray:
+        """Expands the runs into the indices of all changed lanes."""
+        run_of_lane = np.repeat(np.arange(len(self.starts)), self.lengths)
+        return self.starts[run_of_lane] + (np.arange(len(self.deltas)) - self._offsets()[run_of_lane])
+
+    def nbytes(self) -> int:
+        return self.starts.nbytes + self.lengths.nbytes + self.deltas.nbytes
+
+
+class TrajectoryRecorder:
+    """
+    Records batched states step by step in delta-encoded form.
+
+    Args:
+        keyframe_interval: Store a full copy every this many steps. Smaller
+            values make `state_at` faster and use more memory.
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.keyframe_interval = keyframe_interval
+        self.labels = []
+        self._keyframes = {} # step -> full uint16 copy
+        self._keyframe_steps = [] # Sorted keys of _keyframes
+        self._deltas = {} # step -> _DeltaStep
+        self._previous = None
+        self._delta_buffer = None
+        self.num_lanes = None
+
+    @property
+    def num_steps(self) -> int:
+        return len(self.labels)
+
+    def record(self, states, label: str = None) -> None:
+        """Appends the current states (flattened to lanes) as the next step."""
+        states = np.asarray(states).reshape(-1)
+        step = self.num_steps
+        if self._previous is None:
+            self.num_lanes = states.size
+            self._previous = np.empty(states.size, dtype=DELTA_DTYPE)
+            self._delta_buffer = np.empty(states.size, dtype=DELTA_DTYPE)
+        elif states.size != self.num_lanes:
+            raise ValueError(f"Recorder holds {self.num_lanes} lanes, got {states.size}")
+
+        delta_step = None # None stores a keyframe
+        if self._keyframe_steps and step - self._keyframe_steps[-1] < self.keyframe_interval:
+            np.subtract(states, self._previous, out=self._delta_buffer, casting="unsafe")
+            delta_step = self._encode(self._delta_buffer)
+        if delta_step is None:
+            self._keyframes[step] = states.astype(DELTA_DTYPE)
+            self._keyframe_steps.append(step)
+        else:
+            self._deltas[step] = delta_step
+        np.copyto(self._previous, states, casting="unsafe")
+        self.labels.append(label)
+
+    @staticmethod
+    def _encode(delta: np.ndarray):
+        """
+        Run-length encodes the changed lanes of one step.
+
+        Returns None if the encoding would be larger than a keyframe.
+        """
+        changed = delta != 0
+        num_changed = int(np.count_nonzero(changed))
+        if not num_changed:
+            empty = np.empty(0, dtype=_RUN_DTYPE)
+            return _DeltaStep(empty, empty, np.empty(0, dtype=DELTA_DTYPE))
+        # Every run is at least one changed lane, so this bounds the run count from below
+        if _encoded_nbytes(1, num_changed) >= delta.nbytes:
+            return None
+        # Run boundaries are where the changed flag flips (padded with False at both ends)
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], changed, [False]))))
+        if _encoded_nbytes(len(edges) // 2, num_changed) >= delta.nbytes:
+            return None
+        starts = edges[0::2].astype(_RUN_DTYPE)
+        lengths = (edges[1::2] - edges[0::2]).astype(_RUN_DTYPE)
+        return _DeltaStep(starts, lengths, delta[changed])
+
+    def _check_step(self, step: int) -> None:
+        if not (0 <= step < self.num_steps):
+            raise IndexError(f"Step {step} out of range (recorded {self.num_steps} steps)")
+
+    def _keyframe_before(self, step: int) -> int:
+        """Latest keyframe step at or before `step`."""
+        return self._keyframe_steps[bisect.bisect_right(self._keyframe_steps, step) - 1]
+
+    def state_at(self, step: int, lane: int) -> int:
+        """Returns the packed state of trajectory `lane` after step `step`."""
+        self._check_step(step)
+        if not (0 <= lane < self.num_lanes):
+            raise IndexError(f"Lane {lane} out of range ({self.num_lanes} lanes)")
+        key = self._keyframe_before(step)
+        value = int(self._keyframes[key][lane])
+        for s in range(key + 1, step + 1):
+            value = (value + self._deltas[s].delta_for(lane)) & 0xFFFF
+        return value
+
+    def states_at(self, step: int) -> np.ndarray:
+        """Reconstructs the full batch (all lanes) after step `step`."""
+        self._check_step(step)
+        key = self._keyframe_before(step)
+        states = self._keyframes[key].copy()
+        for s in range(key + 1, step + 1):
+            delta_step = self._deltas[s]
+            lanes = delta_step.changed_lanes()
+            states[lanes] += delta_step.deltas # uint16 arithmetic wraps like the encoding
+        return states
+
+    def trajectory(self, lane: int) -> np.ndarray:
+        """Returns the states of one lane across all recorded steps."""
+        values = np.empty(self.num_steps, dtype=DELTA_DTYPE)
+        value = 0
+        for step in range(self.num_steps):
+            if step in self._keyframes:
+                value = int(self._keyframes[step][lane])
+            else:
+                value = (value + self._deltas[step].delta_for(lane)) & 0xFFFF
+            values[step] = value
+        return values
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the stored history."""
+        return (sum(k.nbytes for k in self._keyframes.values())
+                + sum(d.nbytes() for d in self._deltas.values()))
+
+    # --- On-disk Format ---
+
+    def save(self, path) -> None:
+        """
+        Writes the history to a compressed NumPy `.npz` archive.
+
+        Delta steps are concatenated CSR-style: `run_ptr[s]:run_ptr[s+1]`
+        indexes the runs and `delta_ptr[s]:delta_ptr[s+1]` the deltas of
+        step s (empty for keyframe steps).
+        """
+        steps = range(self.num_steps)
+        delta_steps = [self._deltas.get(s) for s in steps]
+        run_counts = [len(d.starts) if d is not None else 0 for d in delta_steps]
+        delta_counts = [len(d.deltas) if d is not None else 0 for d in delta_steps]
+        present = [d for d in delta_steps if d is not None]
+        key_steps = sorted(self._keyframes)
+        np.savez_compressed(
+            path,
+            keyframe_interval=self.keyframe_interval,
+            num_lanes=self.num_lanes if self.num_lanes is not None else 0,
+            labels=np.array(["" if label is None else label for label in self.labels], dtype=str),
+            keyframe_steps=np.array(key_steps, dtype=np.int64),
+            keyframes=(np.stack([self._keyframes[s] for s in key_steps])
+                       if key_steps else np.empty((0, 0), dtype=DELTA_DTYPE)),
+            run_ptr=np.concatenate(([0], np.cumsum(run_counts, dtype=np.int64))),
+            delta_ptr=np.concatenate(([0], np.cumsum(delta_counts, dtype=np.int64))),
+            run_starts=np.concatenate([d.starts for d in present] or [np.empty(0, _RUN_DTYPE)]),
+            run_lengths=np.concatenate([d.lengths for d in present] or [np.empty(0, _RUN_DTYPE)]),
+            deltas=np.concatenate([d.deltas for d in present] or [np.empty(0, DELTA_DTYPE)]),
+        )
+
+    @classmethod
+    def load(cls, path) -> "TrajectoryRecorder":
+        """Reads a history written by `save`; recording can continue afterwards."""
+        with np.load(path) as data:
+            recorder = cls(int(data["keyframe_interval"]))
+            recorder.num_lanes = int(data["num_lanes"])
+            recorder.labels = [label or None for label in data["labels"].tolist()]
+            for step, frame in zip(data["keyframe_steps"].tolist(), data["keyframes"]):
+                recorder._keyframes[step] = frame.copy()
+            recorder._keyframe_steps = sorted(recorder._keyframes)
+            run_ptr, delta_ptr = data["run_ptr"], data["delta_ptr"]
+            starts, lengths, deltas = data["run_starts"], data["run_lengths"], data["deltas"]
+            for step in range(len(recorder.labels)):
+                if step not in recorder._keyframes:
+                    runs = slice(run_ptr[step], run_ptr[step + 1])
+                    recorder._deltas[step] = _DeltaStep(
+                        starts[runs], lengths[runs], deltas[delta_ptr[step]:delta_ptr[step + 1]])
+        if recorder.labels:
+            recorder._previous = recorder.states_at(recorder.num_steps - 1)
+            recorder._delta_buffer = np.empty(recorder.num_lanes, dtype=DELTA_DTYPE)
+        return recorder
@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from classical_quantum_sim import batch, kernels, gates, phase_gates
+
+ALL_STATES = np.arange(1 << 16, dtype=np.uint16)
+
+@pytest.fixture(params=["kernels", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "kernels" and not kernels.HAVE_NUMBA:
+        pytest.skip("Numba not installed")
+    if request.param == "numpy":
+        monkeypatch.setattr(kernels, "HAVE_NUMBA", False)
+    return request.param
+
+def test_apply_H_sim_in_place(backend, capsys):
+    expected = [gates.apply_H_sim(int(q)) for q in ALL_STATES]
+    states = ALL_STATES.copy()
+    result = batch.apply_H_sim(states, out=states, workspace=batch.Workspace())
+    assert result is states
+    assert np.array_equal(states, expected)
+
+def test_apply_H_phase_aware_in_place(backend, capsys):
+    expected = [phase_gates.apply_H_phase_aware(int(q)) for q in ALL_STATES]
+    states = ALL_STATES.copy()
+    batch.apply_H_phase_aware(states, out=states, workspace=batch.Workspace())
+    assert np.array_equal(states, expected)
+
+@pytest.mark.parametrize("angle", [-1.0, math.pi / 2, 6.28])
+def test_apply_PhaseShift_sim_scalar_and_array_angles(backend, angle):
+    expected = [phase_gates.apply_PhaseShift_sim(int(q), angle) for q in ALL_STATES]
+    assert np.array_equal(batch.apply_PhaseShift_sim(ALL_STATES, angle), expected)
+    angles = np.full(ALL_STATES.shape, angle)
+    assert np.array_equal(batch.apply_PhaseShift_sim(ALL_STATES, angles), expected)
+
+def test_measure_statistics_and_collapse(backend):
+    ws = batch.Workspace(seed=7)
+    states = batch.initialize(20000)
+    batch.apply_H_sim(states, out=states, workspace=ws)
+    outcomes = np.empty(states.shape, dtype=batch.OUTCOME_DTYPE)
+    _, collapsed = batch.measure(states, out=states, outcomes=outcomes, workspace=ws)
+    assert collapsed is states
+    assert abs(outcomes.mean() - 0.5) < 0.02
+    assert np.array_equal(collapsed, np.where(outcomes == 1, gates.initialize(1), gates.initialize(0)))
+
+def test_workspace_reuses_buffers():
+    ws = batch.Workspace(seed=0, size=16)
+    first = ws.uniform(16)
+    second = ws.uniform((4, 4))
+    assert np.shares_memory(first, second)
+
+@pytest.mark.parametrize("dtype", [np.uint32, np.uint64])
+def test_dtypes_without_compiled_kernels_use_numpy(dtype):
+    states = ALL_STATES.astype(dtype)
+    ws = batch.Workspace(seed=3)
+    h_states = batch.apply_H_sim(states, workspace=ws)
+    assert h_states.dtype == dtype and np.array_equal(h_states, batch.apply_H_sim(ALL_STATES))
+    assert np.array_equal(batch.get_probability_p1(states), batch.get_probability_p1(ALL_STATES))
+    outcomes, collapsed = batch.measure(h_states, workspace=ws)
+    _, expected = batch.measure(batch.apply_H_sim(ALL_STATES), workspace=batch.Workspace(seed=3))
+    assert collapsed.dtype == dtype and np.array_equal(collapsed, expected)
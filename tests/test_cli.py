@@ -0,0 +1,112 @@
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from classical_quantum_sim import cli, jobs
+
+JOBS = [
+    {"id": "h", "circuit": ["apply_H_phase_aware"], "shots": 2000, "seed": 1},
+    {"id": "hph", "circuit": ["apply_H_phase_aware", ["apply_PhaseShift_sim", 3.14159],
+                              "apply_H_phase_aware"], "shots": 500, "seed": 2},
+    {"id": "one", "circuit": [], "basis_state": 1, "shots": 7, "sampling": "stratified"},
+    {"id": "h-again", "circuit": ["apply_H_phase_aware"], "shots": 2000, "seed": 1},
+    {"id": "hph-half", "circuit": ["apply_H_phase_aware", ["apply_PhaseShift_sim", 1.5708],
+                                   "apply_H_phase_aware"], "shots": 500, "seed": 2},
+] + [
+    # Superpositions with odd shot counts, so every chunk size splits the shots differently
+    {"id": mode, "circuit": ["apply_H_phase_aware"], "shots": 2001, "seed": 3, "sampling": mode}
+    for mode in ("stratified", "sobol", "antithetic")
+]
+
+def run(tmp_path, lines, *options):
+    source = tmp_path / "jobs.jsonl"
+    source.write_text("\n".join(lines) + "\n")
+    output = tmp_path / "results.jsonl"
+    status = cli.main([str(source), "-o", str(output), "-q", *options])
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    return status, {result["id"]: result for result in results}
+
+def test_runs_jobs_in_process(tmp_path):
+    status, results = run(tmp_path, [json.dumps(job) for job in JOBS], "-j", "0")
+    assert status == 0
+    assert results["one"]["ones"] == 7 and results["one"]["state_p1"] == 1.0
+    assert abs(results["h"]["p1"] - 0.5) < 0.05
+    # Same circuit and seed give the same outcomes regardless of batching
+    assert results["h"]["ones"] == results["h-again"]["ones"]
+
+def test_results_do_not_depend_on_grouping_or_workers(tmp_path):
+    lines = [json.dumps(job) for job in JOBS]
+    _, reference = run(tmp_path, lines, "-j", "0")
+    _, pooled = run(tmp_path, lines, "-j", "2", "--batch-size", "1", "--chunk-size", "64")
+    assert pooled == reference
+    _, odd_chunks = run(tmp_path, lines, "-j", "0", "--chunk-size", "7")
+    assert odd_chunks == reference
+    # Stratified counts are within one shot of the exact expectation
+    assert abs(reference["stratified"]["ones"] - 2001 * reference["stratified"]["state_p1"]) <= 1
+
+def test_jobs_differing_only_in_angles_share_a_batch():
+    specs = {spec["id"]: spec for spec in JOBS}
+    key, job = jobs.parse_job(specs["hph"], "hph")
+    half_key, half_job = jobs.parse_job(specs["hph-half"], "hph-half")
+    assert key == half_key and job.phase_deltas == (8,) and half_job.phase_deltas == (4,)
+    assert jobs.parse_job({"circuit": [["apply_PhaseShift_sim", 3.1]]}, 0)[1].phase_deltas == (8,)
+
+def test_invalid_jobs_are_reported_and_skipped(tmp_path):
+    lines = ["not json", json.dumps({"circuit": ["nope"]}), "", json.dumps(JOBS[2]), "[]",
+             json.dumps({"id": "bool-shots", "circuit": [], "shots": True}),
+             json.dumps({"id": "bad-gate", "circuit": ["nope"]}),
+             json.dumps({"id": "list-angle", "circuit": [["apply_PhaseShift_sim", [1, 2]]]}),
+             json.dumps({"id": "extra-arg", "circuit": [["apply_H_sim", 1]]}),
+             json.dumps(JOBS[1])]
+    status, results = run(tmp_path, lines, "-j", "0")
+    assert status == 1
+    invalid = (1, 2, 5, "bool-shots", "bad-gate", "list-angle", "extra-arg")
+    assert set(results) == {"one", "hph", *invalid}
+    assert all("error" in results[key] for key in invalid)
+    assert "shots" in results["bool-shots"]["error"]
+    assert results["one"]["ones"] == 7
+
+def test_missing_numpy_prints_install_hint(monkeypatch, capsys):
+    import classical_quantum_sim
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    monkeypatch.delitem(sys.modules, "classical_quantum_sim.jobs", raising=False)
+    monkeypatch.delattr(classical_quantum_sim, "jobs", raising=False)
+    assert cli.main(["-q"]) == 1
+    assert "pip install classical-quantum-sim[batch]" in capsys.readouterr().err
+
+def test_results_stream_while_input_is_idle(tmp_path, monkeypatch):
+    read_fd, write_fd = os.pipe()
+    monkeypatch.setattr(sys, "stdin", os.fdopen(read_fd, encoding="utf-8"))
+    output = tmp_path / "results.jsonl"
+    status = []
+    command = threading.Thread(target=lambda: status.append(
+        cli.main(["-o", str(output), "-q", "-j", "0", "--linger", "0.01"])))
+    command.start()
+    with os.fdopen(write_fd, "w", encoding="utf-8") as stdin:
+        stdin.write(json.dumps(JOBS[0]) + "\n")
+        stdin.flush()
+        # The batch is not full and input stays open, yet the result arrives
+        deadline = time.monotonic() + 10
+        while not (output.exists() and output.read_text()) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert json.loads(output.read_text())["id"] == "h"
+    command.join()
+    assert status == [0]
+
+def test_unopenable_paths_are_usage_errors(tmp_path, capsys):
+    with pytest.raises(SystemExit) as missing_input:
+        cli.main([str(tmp_path / "missing.jsonl"), "-q"])
+    assert missing_input.value.code == 2
+    assert "missing.jsonl" in capsys.readouterr().err
+    source = tmp_path / "jobs.jsonl"
+    source.write_text("")
+    with pytest.raises(SystemExit) as bad_output:
+        cli.main([str(source), "-o", str(tmp_path / "no-such-dir" / "out.jsonl"), "-q"])
+    assert bad_output.value.code == 2
+    assert "no-such-dir" in capsys.readouterr().err
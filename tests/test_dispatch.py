@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import classical_quantum_sim as cqs
+from classical_quantum_sim import batch, dispatch, gates, kernels, phase_gates
+from classical_quantum_sim.session import Session
+
+ALL_STATES = np.arange(1 << 16, dtype=batch.STATE_DTYPE)
+BACKENDS = [b for b in dispatch.BACKENDS if b != "compiled" or kernels.HAVE_NUMBA]
+
+@pytest.fixture(autouse=True)
+def isolated_profile(tmp_path, monkeypatch):
+    """Keeps every test away from the user's calibration cache and environment."""
+    monkeypatch.setenv(dispatch.CACHE_ENV, str(tmp_path / "dispatch.json"))
+    monkeypatch.delenv(dispatch.BACKEND_ENV, raising=False)
+    dispatch.reload()
+    yield tmp_path / "dispatch.json"
+    monkeypatch.undo()
+    dispatch.reload()
+
+def run_all(backend):
+    with dispatch.use_backend(backend):
+        h = cqs.apply_H_sim(ALL_STATES)
+        hp = cqs.apply_H_phase_aware(ALL_STATES)
+        shifted = cqs.apply_PhaseShift_sim(ALL_STATES, 2.5)
+        p1 = cqs.get_probability_p1(ALL_STATES)
+        outcomes, collapsed = cqs.measure(ALL_STATES, workspace=batch.Workspace(seed=9))
+    return h, hp, shifted, p1, outcomes, collapsed
+
+def test_scalar_inputs_use_scalar_functions():
+    assert cqs.initialize(1) == gates.initialize(1)
+    assert cqs.apply_H_phase_aware(np.uint16(65473)) == phase_gates.apply_H_phase_aware(65473)
+    assert cqs.measure(cqs.apply_H_sim(0), session=Session(seed=4)) == gates.measure(
+        gates.apply_H_sim(0), session=Session(seed=4))
+
+def test_backends_agree_on_every_state():
+    reference = run_all("numpy")
+    for backend in BACKENDS:
+        for expected, actual in zip(reference, run_all(backend)):
+            assert np.array_equal(expected, actual), backend
+
+def test_forced_backend_falls_back_when_unsupported(monkeypatch):
+    wide = ALL_STATES.astype(np.int64)
+    with dispatch.use_backend("lut"):
+        assert dispatch.select_backend("apply_H_sim", ALL_STATES) == "lut"
+        assert dispatch.select_backend("apply_H_sim", wide) == "numpy"
+        assert dispatch.select_backend("apply_PhaseShift_sim", ALL_STATES, np.zeros(1)) == "numpy"
+    if kernels.HAVE_NUMBA:
+        with dispatch.use_backend("compiled"):
+            assert dispatch.select_backend("apply_H_sim", ALL_STATES) == "compiled"
+            assert dispatch.select_backend("measure", ALL_STATES.astype(np.uint64)) == "numpy"
+    for dtype in (np.uint32, np.uint64): # No compiled loops: NumPy keeps the dtype
+        states = ALL_STATES.astype(dtype)
+        assert dispatch.available_backends("apply_H_sim", states) == ("numpy",)
+        assert cqs.apply_H_sim(states).dtype == dtype
+        assert np.array_equal(cqs.get_probability_p1(states), cqs.get_probability_p1(ALL_STATES))
+        assert cqs.measure(states)[1].dtype == dtype
+    monkeypatch.setenv(dispatch.BACKEND_ENV, "numpy")
+    dispatch.reload()
+    assert dispatch.select_backend("measure", ALL_STATES) == "numpy"
+    with pytest.raises(ValueError):
+        dispatch.set_backend("gpu")
+
+def test_profile_thresholds_select_by_size(isolated_profile):
+    isolated_profile.write_text(json.dumps({
+        "version": dispatch.PROFILE_VERSION,
+        "ops": {"apply_H_sim": [[0, "lut"], [1000, "numpy"]]},
+    }))
+    dispatch.reload()
+    assert dispatch.select_backend("apply_H_sim", ALL_STATES[:999]) == "lut"
+    assert dispatch.select_backend("apply_H_sim", ALL_STATES[:1000]) == "numpy"
+
+def test_calibrate_writes_cache(isolated_profile):
+    profile = dispatch.calibrate(sizes=(1, 256), repeat=1)
+    assert json.loads(isolated_profile.read_text()) == profile
+    assert set(profile["ops"]) == set(dispatch.CALIBRATED_OPS)
+    for thresholds in profile["ops"].values():
+        assert thresholds[0][0] == 0 and all(b in BACKENDS for _, b in thresholds)
+    assert dispatch.load_profile() == profile
+
+def test_measure_bell_single_pair_and_batch():
+    session = Session(seed=2)
+    a, b, pair_id = cqs.create_bell_pair_sim("psi+", session=session)
+    outcome, collapsed_a, collapsed_b = cqs.measure_bell(a, b, "psi+", pair_id=pair_id, session=session)
+    assert cqs.get_basis_state(collapsed_b) == 1 - outcome and not session.pairs
+    states = batch.apply_H_sim(batch.initialize(32))
+    outcomes, _, partners = cqs.measure_bell(states, states.copy(), "phi-", session=session)
+    assert np.array_equal(batch.get_basis_state(partners), outcomes)
+
+def test_batch_measurement_follows_session_seed():
+    states = cqs.apply_H_sim(cqs.initialize(shape=256))
+    first, _ = cqs.measure(states, session=Session(seed=11))
+    second, _ = cqs.measure(states, session=Session(seed=11))
+    assert np.array_equal(first, second)
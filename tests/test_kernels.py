@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("numba")
+
+from classical_quantum_sim import kernels, encoding, gates, phase_gates
+
+ALL_STATES = np.arange(1 << 16, dtype=np.uint16)
+
+def test_kernels_are_ufuncs():
+    assert kernels.HAVE_NUMBA
+    assert isinstance(kernels.apply_H_sim, np.ufunc)
+
+def test_get_probability_p1_matches_scalar():
+    expected = [encoding.get_probability_p1(int(q)) for q in ALL_STATES]
+    assert np.array_equal(kernels.get_probability_p1(ALL_STATES), expected)
+
+def test_apply_H_phase_aware_matches_scalar():
+    expected = [phase_gates.apply_H_phase_aware(int(q)) for q in ALL_STATES]
+    assert np.array_equal(kernels.apply_H_phase_aware(ALL_STATES), expected)
+
+@pytest.mark.parametrize("angle", [-7.1, 0.0, 0.2, math.pi, 6.28])
+def test_apply_PhaseShift_sim_matches_scalar(angle):
+    expected = [phase_gates.apply_PhaseShift_sim(int(q), angle) for q in ALL_STATES]
+    assert np.array_equal(kernels.apply_PhaseShift_sim(ALL_STATES, angle), expected)
+
+def test_in_place_and_broadcasting():
+    states = np.full(8, gates.initialize(1), dtype=np.uint16)
+    result = kernels.apply_H_sim(states, out=states)
+    assert result is states
+    assert np.all(states == gates.apply_H_sim(gates.initialize(1)))
+    grid = kernels.set_phase_index(states[:, None], np.arange(16)[None, :])
+    assert grid.shape == (8, 16)
+    assert np.array_equal(kernels.get_phase_index(grid[0]), np.arange(16))
+
+def test_measure_returns_collapsed_states():
+    states = np.full(4, 512 << 6, dtype=np.uint16)
+    draws = np.array([0.0, 0.49, 0.51, 0.99])
+    collapsed = kernels.measure(states, draws)
+    assert list(kernels.get_basis_state(collapsed)) == [1, 1, 0, 0]
+    assert list(collapsed) == [gates.initialize(1)] * 2 + [gates.initialize(0)] * 2
+
+def test_kernels_compile_on_first_access():
+    import importlib
+    fresh = importlib.reload(kernels)
+    assert "apply_H_phase_aware" not in vars(fresh)
+    assert isinstance(fresh.apply_H_phase_aware, np.ufunc)
+    assert fresh.apply_H_phase_aware is vars(fresh)["apply_H_phase_aware"]
+    assert fresh.measure_phase_aware is fresh.measure
+    assert "shift_phase_index" in dir(fresh)
@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from classical_quantum_sim import batch, encoding, sampling
+
+@pytest.mark.parametrize("mode", sampling.SAMPLING_MODES)
+def test_fill_uniform_range_and_mean(mode):
+    draws = sampling.fill_uniform(np.empty(10000), mode, np.random.default_rng(0))
+    assert draws.min() >= 0.0 and draws.max() < 1.0 + 1e-12
+    assert abs(draws.mean() - 0.5) < 0.02
+
+def test_stratified_beats_iid_for_same_shots():
+    state = encoding.set_probability_p1(0, 0.3)
+    true_p1 = encoding.get_probability_p1(state)
+    errors = {}
+    for mode in ("iid", "stratified"):
+        estimates = [sampling.estimate_p1(state, 800, mode, seed=s).p1 for s in range(50)]
+        errors[mode] = np.sqrt(np.mean((np.array(estimates) - true_p1) ** 2))
+    assert errors["stratified"] * 10 < errors["iid"]
+
+@pytest.mark.parametrize("mode", sampling.SAMPLING_MODES)
+def test_count_ones_does_not_depend_on_chunk_size(mode):
+    counts = {sampling.count_ones(0.3, 1001, mode, np.random.default_rng(4), chunk_size)
+              for chunk_size in (None, 1, 2, 7, 64, 1000)}
+    assert len(counts) == 1
+    assert abs(counts.pop() - 300.3) < (1 if mode == "stratified" else 60)
+
+def test_estimate_reports_stderr_per_state():
+    states = np.array([encoding.set_probability_p1(0, p) for p in (0.0, 0.25, 1.0)])
+    estimate = sampling.estimate_p1(states, 1000, "sobol", seed=2)
+    assert estimate.p1.shape == estimate.stderr.shape == (3,)
+    assert estimate.p1[0] == 0.0 and estimate.p1[2] == 1.0
+    assert abs(estimate.p1[1] - 0.25) < 0.01
+
+@pytest.mark.parametrize("mode", sampling.SAMPLING_MODES)
+def test_batched_measure_sampling_option(mode):
+    ws = batch.Workspace(seed=4)
+    states = batch.initialize(4000)
+    batch.apply_H_sim(states, out=states, workspace=ws)
+    outcomes, _ = batch.measure(states, workspace=ws, sampling=mode)
+    assert abs(outcomes.mean() - 0.5) < 0.05
+
+def test_measure_bell_correlations():
+    ws = batch.Workspace(seed=5)
+    qa = batch.apply_H_sim(batch.initialize(64))
+    qb = qa.copy()
+    outcomes, _, collapsed_b = batch.measure_bell(qa, qb, "phi+", workspace=ws, sampling="antithetic")
+    assert np.array_equal(batch.get_basis_state(collapsed_b), outcomes)
+    outcomes, _, collapsed_b = batch.measure_bell(qa, qb, "psi-", workspace=ws)
+    assert np.array_equal(batch.get_basis_state(collapsed_b), 1 - outcomes)
+    with pytest.raises(ValueError):
+        batch.measure(qa, sampling="bogus")
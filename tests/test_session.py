@@ -0,0 +1,127 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from classical_quantum_sim import entanglement, gates, phase_gates
+from classical_quantum_sim.session import Session, current_session
+
+def measure_many(count, session=None):
+    q = gates.apply_H_sim(gates.initialize())
+    return [gates.measure(q, session=session)[0] for _ in range(count)]
+
+def test_seeded_sessions_are_reproducible():
+    assert measure_many(50, Session(seed=3)) == measure_many(50, Session(seed=3))
+    with Session(seed=3):
+        assert measure_many(50) == measure_many(50, Session(seed=3))
+
+def test_session_owns_pairs_and_diagnostics(capsys):
+    session = Session(echo_warnings=False)
+    _, _, pair_id = entanglement.create_bell_pair_sim("psi+", session=session)
+    phase_gates.apply_H_phase_aware(phase_gates.apply_H_phase_aware(0), session=session)
+    phase_gates.measure_phase_aware(0, session=session)
+    assert session.pairs[pair_id]["bell_type"] == "psi+"
+    assert pair_id not in current_session().pairs
+    assert session.diagnostics.counters == {"bell_pair": 1, "debug": 1, "warning": 1, "measure": 1}
+    assert session.diagnostics.messages[-1][0] == "warning"
+    assert capsys.readouterr().out == ""
+    assert session.release_pair(pair_id)["bell_type"] == "psi+" and not session.pairs
+
+def test_legacy_registry_is_current_session_store():
+    with Session() as session:
+        _, _, pair_id = entanglement.create_bell_pair_sim()
+        assert entanglement.entangled_pairs_registry is session.pairs
+        assert pair_id in entanglement.entangled_pairs_registry
+
+def test_threads_get_separate_default_sessions():
+    def work(_):
+        entanglement.create_bell_pair_sim()
+        measure_many(10)
+        return current_session()
+    with ThreadPoolExecutor(4) as executor:
+        sessions = set(executor.map(work, range(4 * 8)))
+    assert current_session() not in sessions
+    assert sum(s.diagnostics.counters["measure"] for s in sessions) == 4 * 8 * 10
+    assert sum(len(s.pairs) for s in sessions) == 4 * 8
+
+def test_shared_session_loses_no_updates():
+    session = Session(seed=1)
+    barrier = threading.Barrier(4)
+    def work(_):
+        barrier.wait()
+        for _ in range(200):
+            entanglement.create_bell_pair_sim(session=session)
+            gates.measure(0, session=session)
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(work, range(4)))
+    assert len(session.pairs) == session.diagnostics.counters["bell_pair"] == 800
+    assert session.diagnostics.counters["measure"] == 800
+
+def test_batched_gates_in_threads_match_serial():
+    np = pytest.importorskip("numpy")
+    from classical_quantum_sim import batch
+    def run(seed):
+        session = Session(seed=seed)
+        states = batch.initialize(1 << 16)
+        batch.apply_H_phase_aware(states, out=states, workspace=session.workspace)
+        batch.apply_PhaseShift_sim(states, 1.0, out=states, workspace=session.workspace)
+        outcomes, _ = batch.measure(states, out=states, workspace=session.workspace)
+        return states, outcomes
+    with ThreadPoolExecutor(4) as executor:
+        threaded = list(executor.map(run, range(8)))
+    for seed, (states, outcomes) in enumerate(threaded):
+        expected_states, expected_outcomes = run(seed)
+        assert np.array_equal(states, expected_states)
+        assert np.array_equal(outcomes, expected_outcomes)
+
+def test_threads_can_enter_one_session_at_once():
+    session = Session(seed=2)
+    barrier = threading.Barrier(8)
+    def work(_):
+        with session:
+            barrier.wait() # Every thread is inside the block before any leaves it
+            with Session() as inner:
+                assert current_session() is inner
+            assert current_session() is session
+        return current_session() is not session
+    with ThreadPoolExecutor(8) as executor:
+        assert all(executor.map(work, range(8)))
+
+def test_batched_draws_follow_the_session_seed():
+    np = pytest.importorskip("numpy")
+    from classical_quantum_sim import batch, sweep
+    def run():
+        with Session(seed=4):
+            states = batch.apply_H_sim(batch.initialize(1000))
+            outcomes, _ = batch.measure(states)
+            counts = sweep.sweep(["apply_H_sim"], {}, shots=100).counts
+        return outcomes, counts
+    (outcomes, counts), (again, counts_again) = run(), run()
+    assert np.array_equal(outcomes, again) and np.array_equal(counts, counts_again)
+
+def test_shared_session_gives_threads_their_own_workspace():
+    np = pytest.importorskip("numpy")
+    import classical_quantum_sim as cqs
+    from classical_quantum_sim import batch, dispatch
+    session = Session(seed=5)
+    states = batch.apply_H_phase_aware(batch.initialize(1 << 16))
+    expected = batch.apply_PhaseShift_sim(batch.apply_H_sim(states), 1.0)
+    barrier = threading.Barrier(8)
+    def work(_):
+        with dispatch.use_backend("numpy"):
+            barrier.wait()
+            results = []
+            for _ in range(20):
+                result = cqs.apply_H_sim(states, session=session)
+                results.append(cqs.apply_PhaseShift_sim(result, 1.0, out=result, session=session))
+            outcomes, _ = cqs.measure(results[-1], session=session)
+        return session.workspace, results, outcomes
+    with ThreadPoolExecutor(8) as executor:
+        threaded = list(executor.map(work, range(8)))
+    assert len({id(workspace) for workspace, _, _ in threaded}) == 8
+    for _, results, outcomes in threaded:
+        assert all(np.array_equal(result, expected) for result in results)
+        assert 0.45 < outcomes.mean() < 0.55
+    # The first thread's workspace draws exactly like one seeded with the session seed
+    first = Session(seed=5).workspace.rng.random(4)
+    assert np.array_equal(first, batch.Workspace(seed=5).rng.random(4))
@@ -0,0 +1,35 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from classical_quantum_sim import shared, batch, gates, phase_gates
+
+def test_split_is_byte_aligned():
+    with shared.SharedBatch.create(1001) as sb:
+        descriptors = sb.split(3)
+        assert [d.start % 8 for d in descriptors] == [0, 0, 0]
+        assert descriptors[0].start == 0 and descriptors[-1].stop == 1001
+
+def test_run_slice_in_process_matches_outcome_bits():
+    with shared.SharedBatch.create(100, basis_state=1) as sb:
+        ones = shared.run_slice(sb.descriptor(), [phase_gates.apply_H_phase_aware], seed=5, chunk_size=16)
+        outcomes = sb.outcomes()
+        assert ones == int(outcomes.sum())
+        expected = np.where(outcomes == 1, gates.initialize(1), gates.initialize(0))
+        assert np.array_equal(sb.states, expected)
+
+def test_run_parallel_with_pool():
+    circuit = [phase_gates.apply_H_phase_aware, (phase_gates.apply_PhaseShift_sim, math.pi)]
+    with shared.SharedBatch.create(4096) as sb:
+        ones = shared.run_parallel(sb, circuit, seed=1, processes=2)
+        assert ones == int(sb.outcomes().sum())
+        assert 0.4 < ones / 4096 < 0.6
+
+def test_resolve_circuit_accepts_scalar_gates_and_names():
+    resolved = batch.resolve_circuit([gates.apply_H_sim, ("apply_PhaseShift_sim", 1.0)])
+    assert resolved == [("apply_H_sim", ()), ("apply_PhaseShift_sim", (1.0,))]
+    assert batch.resolve_circuit(resolved) == resolved
+    with pytest.raises(ValueError):
+        batch.resolve_circuit([gates.measure])
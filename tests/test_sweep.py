@@ -0,0 +1,39 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from classical_quantum_sim import phase_gates
+from classical_quantum_sim.sweep import Param, sweep
+
+CIRCUIT = [
+    phase_gates.apply_H_phase_aware,
+    (phase_gates.apply_PhaseShift_sim, Param("theta")),
+    phase_gates.apply_H_phase_aware,
+]
+
+def test_sweep_matches_scalar_loop(capsys):
+    axes = {"basis_state": [0, 1], "theta": np.linspace(-4, 4, 21), "initial_phase_index": [0, 5]}
+    result = sweep(CIRCUIT, axes)
+    assert result.states.shape == (2, 21, 2)
+    for i, basis in enumerate(axes["basis_state"]):
+        for j, theta in enumerate(axes["theta"]):
+            for k, index in enumerate(axes["initial_phase_index"]):
+                q = phase_gates.initialize_phase_aware(basis, index)
+                q = phase_gates.apply_H_phase_aware(q)
+                q = phase_gates.apply_PhaseShift_sim(q, theta)
+                q = phase_gates.apply_H_phase_aware(q)
+                assert result.states[i, j, k] == q
+
+def test_sweep_deduplicates_quantized_angles():
+    result = sweep(CIRCUIT, {"theta": np.linspace(0, 2 * math.pi, 100000)}, shots=50, seed=3)
+    assert result.num_distinct <= 16
+    assert result.p1.shape == result.counts.shape == (100000,)
+    assert ((result.counts >= 0) & (result.counts <= 50)).all()
+
+def test_sweep_rejects_unbound_or_unused_axes():
+    with pytest.raises(ValueError):
+        sweep(CIRCUIT, {})
+    with pytest.raises(ValueError):
+        sweep(CIRCUIT, {"theta": [0.0], "phi": [1.0]})
@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from classical_quantum_sim import table, encoding, phase_encoding, entanglement_encoding
+
+STATES = np.random.default_rng(3).integers(0, 1 << 16, 5000).astype(np.uint16)
+
+def test_columns_match_scalar_decoders():
+    t = table.decode(STATES)
+    assert len(t) == len(STATES)
+    assert np.array_equal(t.p1, [encoding.get_probability_p1(int(q)) for q in STATES])
+    assert np.array_equal(t.basis, [encoding.get_basis_state(int(q)) for q in STATES])
+    assert np.array_equal(t.phase_radians, [phase_encoding.get_phase_radians(int(q)) for q in STATES])
+    assert np.array_equal(t["ent_id"], [entanglement_encoding.get_entanglement_id(int(q)) for q in STATES])
+
+def test_state_class():
+    t = table.decode(np.array([encoding.set_probability_p1(0, p) for p in (0.0, 1.0, 0.5)]))
+    assert list(t.state_class) == [table.StateClass.ZERO, table.StateClass.ONE, table.StateClass.SUPERPOSITION]
+
+def test_summary_matches_columns():
+    t = table.decode(STATES)
+    summary = t.summary()
+    assert summary.total == len(STATES)
+    assert np.array_equal(summary.basis, np.bincount(t.basis, minlength=4))
+    assert np.array_equal(summary.phase_index, np.bincount(t.phase_index, minlength=16))
+    assert np.array_equal(summary.state_class, np.bincount(t.state_class, minlength=3))
+    assert summary.prob_int.sum() == len(STATES)
+
+def test_format_slice_only():
+    t = table.decode(STATES)
+    rows = t.format(10, 13, kind="phase")
+    assert rows == [phase_encoding.phase_qsim_repr(int(q)) for q in STATES[10:13]]
+    with pytest.raises(ValueError):
+        t.format(kind="bogus")
+
+def test_summary_rejects_values_outside_16_bits():
+    with pytest.raises(ValueError):
+        table.summarize(np.array([70000, 5], dtype=np.int32))
+    with pytest.raises(ValueError):
+        table.summarize(np.array([-1, 5], dtype=np.int64))
+    assert table.summarize(np.array([65535, 5], dtype=np.int32)).total == 2
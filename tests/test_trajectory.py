@@ -0,0 +1,84 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from classical_quantum_sim import batch, trajectory
+
+def _run_recorded(keyframe_interval=3, lanes=257):
+    recorder = trajectory.TrajectoryRecorder(keyframe_interval=keyframe_interval)
+    ws = batch.Workspace(seed=11, recorder=recorder)
+    states = batch.initialize(lanes)
+    recorder.record(states, label="initialize")
+    history = [states.copy()]
+    for _ in range(4):
+        batch.apply_H_phase_aware(states, out=states, workspace=ws)
+        history.append(states.copy())
+        # Only some lanes change: the rest are run-length encoded away
+        states[::5] = batch.apply_PhaseShift_sim(states[::5], math.pi / 2)
+        batch.apply_PhaseShift_sim(states, 0.0, out=states, workspace=ws)
+        history.append(states.copy())
+        batch.measure(states, out=states, workspace=ws)
+        history.append(states.copy())
+    return recorder, history
+
+def test_random_access_matches_history():
+    recorder, history = _run_recorded()
+    assert recorder.num_steps == len(history)
+    assert recorder.labels[:3] == ["initialize", "apply_H_phase_aware", "apply_PhaseShift_sim"]
+    for step, expected in enumerate(history):
+        assert np.array_equal(recorder.states_at(step), expected)
+        assert recorder.state_at(step, 5) == expected[5]
+    assert np.array_equal(recorder.trajectory(10), [h[10] for h in history])
+
+def test_save_and_load_round_trip(tmp_path):
+    recorder, history = _run_recorded()
+    path = tmp_path / "trajectory.npz"
+    recorder.save(path)
+    loaded = trajectory.TrajectoryRecorder.load(path)
+    assert loaded.labels == recorder.labels
+    for step, expected in enumerate(history):
+        assert np.array_equal(loaded.states_at(step), expected)
+
+def test_no_recording_without_recorder():
+    states = batch.initialize(8)
+    ws = batch.Workspace()
+    assert ws.recorder is None
+    batch.apply_H_sim(states, out=states, workspace=ws)
+
+def test_alternating_changes_never_exceed_keyframe_size(tmp_path):
+    lanes = 100_000
+    recorder = trajectory.TrajectoryRecorder(keyframe_interval=8)
+    ws = batch.Workspace(seed=5, recorder=recorder)
+    states = batch.initialize(lanes)
+    recorder.record(states, label="initialize")
+    history = [states.copy()]
+    for _ in range(5):
+        states[::2] = batch.apply_H_sim(states[::2]) # Every other lane in superposition
+        recorder.record(states, label="H on even lanes")
+        history.append(states.copy())
+        batch.measure(states, out=states, workspace=ws)
+        history.append(states.copy())
+    assert recorder.nbytes() <= recorder.num_steps * lanes * 2
+    recorder.save(tmp_path / "alternating.npz")
+    loaded = trajectory.TrajectoryRecorder.load(tmp_path / "alternating.npz")
+    for step, expected in enumerate(history):
+        assert np.array_equal(recorder.states_at(step), expected)
+        assert np.array_equal(loaded.states_at(step), expected)
+        assert recorder.state_at(step, 7) == expected[7]
+
+def test_session_workspace_records_calls_without_workspace():
+    import classical_quantum_sim as cqs
+    from classical_quantum_sim.session import Session
+    with Session(seed=1) as session:
+        recorder = session.workspace.recorder = trajectory.TrajectoryRecorder()
+        states = batch.initialize(64)
+        batch.apply_H_sim(states, out=states)
+        cqs.apply_PhaseShift_sim(states, 1.0, out=states)
+        cqs.get_probability_p1(states) # Decoders are not recorded
+        cqs.measure(states, out=states)
+        _, collapsed_a, _ = batch.measure_bell(states, batch.initialize(64))
+    assert recorder.labels == ["apply_H_sim", "apply_PhaseShift_sim", "measure", "measure_bell"]
+    assert np.array_equal(recorder.states_at(2), states)
+    assert np.array_equal(recorder.states_at(3), collapsed_a)